@@ -10,7 +10,12 @@ setup(
     author='Corentin Henry',
     author_email='corentin.henry@gmail.com',
     license='GPLv3',
-    packages=['simple_ostinato', 'simple_ostinato.protocols'],
+    packages=['simple_ostinato', 'simple_ostinato.protocols',
+              'simple_ostinato.aio'],
     package_data={},
     install_requires=[line for line in open('requirements.txt')],
+    extras_require={
+        'aio': ['trollius; python_version < "3"',
+                'futures; python_version < "3"'],
+    },
 )
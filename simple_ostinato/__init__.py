@@ -1,6 +1,7 @@
 from .stream import Stream
 from .port import Port
 from .drone import Drone
+from .pool import DronePool
 
 
-__all__ = ['Drone', 'Port', 'Stream']
+__all__ = ['Drone', 'DronePool', 'Port', 'Stream']
@@ -0,0 +1,18 @@
+"""
+This package provides an asynchronous front-end to :class:`Drone`,
+:class:`Port` and :class:`Stream`, for asyncio (or trollius, on Python 2).
+"""
+try:
+    try:
+        import asyncio
+    except ImportError:
+        import trollius
+    from concurrent import futures
+except ImportError as exc:
+    raise ImportError(
+        'simple_ostinato.aio needs asyncio and concurrent.futures (trollius '
+        'and futures on Python 2), that are installed by the "aio" extra: '
+        'pip install simple_ostinato[aio] ({})'.format(exc))
+from .wrappers import AsyncDrone, AsyncPort, AsyncStream
+
+__all__ = ['AsyncDrone', 'AsyncPort', 'AsyncStream']
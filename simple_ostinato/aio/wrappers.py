@@ -0,0 +1,208 @@
+"""
+The calls to the drone instances are blocking, so the asynchronous objects
+defined here perform them in a worker thread, and return futures that can be
+awaited (or yielded from) in an event loop. Each :class:`AsyncDrone` has its
+own worker thread: the calls to a given drone instance are performed one
+after the other, in the order they were issued, while the calls to different
+drone instances run concurrently.
+"""
+import functools
+import weakref
+try:
+    import asyncio
+except ImportError:
+    import trollius as asyncio
+from concurrent import futures
+from ..drone import Drone
+from ..port import Port
+from ..stream import Stream
+
+
+def _async(name):
+    """
+    Return a method that calls the ``name`` method of the wrapped object in
+    the worker thread, and returns a future.
+    """
+    def method(self, *args, **kwargs):
+        return self._run(getattr(self._wrapped, name), *args, **kwargs)
+    method.__name__ = name
+    method.__doc__ = 'Asynchronous version of ``{}()``. Return a future.' \
+        .format(name)
+    return method
+
+
+class _AsyncWrapper(object):
+
+    """
+    Base class for the asynchronous objects. The attributes that are not
+    defined by the subclasses are read from and written to the wrapped
+    object, so the configuration is still done by setting attributes.
+    """
+
+    def __init__(self, async_drone, wrapped):
+        object.__setattr__(self, '_async_drone', async_drone)
+        object.__setattr__(self, '_wrapped', wrapped)
+
+    def __getattr__(self, name):
+        return getattr(self._wrapped, name)
+
+    def __setattr__(self, name, value):
+        setattr(self._wrapped, name, value)
+
+    def __str__(self):
+        return str(self._wrapped)
+
+    def _run(self, function, *args, **kwargs):
+        return self._async_drone._run(function, *args, **kwargs)
+
+    def _wrap(self, obj):
+        return self._async_drone._wrap(obj)
+
+
+class AsyncStream(_AsyncWrapper):
+
+    """
+    Asynchronous version of :class:`Stream`.
+    """
+
+    save = _async('save')
+    fetch = _async('fetch')
+
+
+class AsyncPort(_AsyncWrapper):
+
+    """
+    Asynchronous version of :class:`Port`. The methods that return
+    :class:`Stream` objects return :class:`AsyncStream` objects instead.
+    """
+
+    fetch = _async('fetch')
+    save = _async('save')
+    fetch_streams = _async('fetch_streams')
+    del_stream = _async('del_stream')
+    del_streams = _async('del_streams')
+    start_send = _async('start_send')
+    stop_send = _async('stop_send')
+    start_capture = _async('start_capture')
+    stop_capture = _async('stop_capture')
+    clear_stats = _async('clear_stats')
+    get_stats = _async('get_stats')
+    get_capture = _async('get_capture')
+
+    @property
+    def streams(self):
+        return [self._wrap(stream) for stream in self._wrapped.streams]
+
+    def get_stream(self, stream_id):
+        return self._wrap(self._wrapped.get_stream(stream_id))
+
+    def get_streams_by_name(self, name):
+        return [self._wrap(stream)
+                for stream in self._wrapped.get_streams_by_name(name)]
+
+    def add_stream(self, *layers):
+        """
+        Asynchronous version of :meth:`Port.add_stream()`. Return a future
+        whose result is an :class:`AsyncStream`.
+        """
+        def add_stream():
+            return self._wrap(self._wrapped.add_stream(*layers))
+        return self._run(add_stream)
+
+    def add_streams(self, specs):
+        """
+        Asynchronous version of :meth:`Port.add_streams()`. Return a future
+        whose result is a list of :class:`AsyncStream`.
+        """
+        def add_streams():
+            return [self._wrap(stream)
+                    for stream in self._wrapped.add_streams(specs)]
+        return self._run(add_streams)
+
+    def replace_streams(self, specs):
+        """
+        Asynchronous version of :meth:`Port.replace_streams()`. Return a
+        future whose result is a list of :class:`AsyncStream`.
+        """
+        def replace_streams():
+            return [self._wrap(stream)
+                    for stream in self._wrapped.replace_streams(specs)]
+        return self._run(replace_streams)
+
+
+class AsyncDrone(_AsyncWrapper):
+
+    """
+    Asynchronous version of :class:`Drone`. Unlike :class:`Drone`, it does
+    not connect when it is created: :meth:`connect()` must be called (and
+    awaited) first.
+
+        >>> loop = asyncio.get_event_loop()
+        >>> drones = [AsyncDrone(host) for host in hosts]
+        >>> loop.run_until_complete(
+        ...     asyncio.gather(*[drone.connect() for drone in drones]))
+        >>> loop.run_until_complete(
+        ...     asyncio.gather(*[drone.fetch_ports() for drone in drones]))
+
+    Args:
+
+        host (str): see :class:`Drone`
+        loop: the event loop the futures belong to. By default, the current
+            event loop.
+        kwargs: other arguments for :class:`Drone` (except ``connect``)
+    """
+
+    def __init__(self, host, loop=None, **kwargs):
+        super(AsyncDrone, self).__init__(self, Drone(host, connect=False,
+                                                     **kwargs))
+        object.__setattr__(self, '_loop', loop or asyncio.get_event_loop())
+        object.__setattr__(self, '_executor',
+                           futures.ThreadPoolExecutor(max_workers=1))
+        object.__setattr__(self, '_wrappers', weakref.WeakKeyDictionary())
+
+    def _run(self, function, *args, **kwargs):
+        return self._loop.run_in_executor(
+            self._executor, functools.partial(function, *args, **kwargs))
+
+    def _wrap(self, obj):
+        if obj is None:
+            return None
+        try:
+            return self._wrappers[obj]
+        except KeyError:
+            if isinstance(obj, Port):
+                wrapper = AsyncPort(self, obj)
+            elif isinstance(obj, Stream):
+                wrapper = AsyncStream(self, obj)
+            else:
+                raise TypeError('Cannot wrap {!r}'.format(obj))
+            self._wrappers[obj] = wrapper
+            return wrapper
+
+    connect = _async('connect')
+    disconnect = _async('disconnect')
+    reconnect = _async('reconnect')
+    fetch_ports = _async('fetch_ports')
+    start_send = _async('start_send')
+    stop_send = _async('stop_send')
+    start_capture = _async('start_capture')
+    stop_capture = _async('stop_capture')
+    clear_stats = _async('clear_stats')
+    get_stats = _async('get_stats')
+
+    def close(self):
+        """
+        Stop the worker thread once the pending calls are done. The object
+        cannot be used anymore afterwards.
+        """
+        self._executor.shutdown(wait=False)
+
+    @property
+    def ports(self):
+        return [self._wrap(port) for port in self._wrapped.ports]
+
+    def get_port(self, name):
+        return self._wrap(self._wrapped.get_port(name))
+
+    def get_port_by_id(self, port_id):
+        return self._wrap(self._wrapped.get_port_by_id(port_id))
@@ -0,0 +1,173 @@
+"""
+This module provides fast conversions between the integers that are stored in
+the protocol buffer messages, and the MAC and IPv4 addresses strings.
+
+Each conversion has a bulk variant that converts a whole sequence at once,
+which is noticeably faster when building many streams.
+"""
+import re
+import socket
+import struct
+
+# 'AA-BB-CC-DD-EE-FF'
+_MAC_FORMAT = '-'.join(['{}{}'] * 6)
+_MAX_MAC = 0xffffffffffff
+_MAX_IP4 = 0xffffffff
+# number of groups of a MAC address: number of bits per group
+_MAC_GROUPS = {6: 8, 3: 16, 2: 24}
+_HEX_DIGITS = frozenset('0123456789abcdefABCDEF')
+# the usual format, parsed with a single regex match
+_MAC_RE = re.compile(
+    r'[0-9a-fA-F]{2}([:-])(?:[0-9a-fA-F]{2}\1){4}[0-9a-fA-F]{2}\Z')
+
+
+def _check_range(integer, maximum, kind):
+    if not 0 <= integer <= maximum:
+        raise ValueError('{} is out of range for {} addresses'
+                         .format(integer, kind))
+    return integer
+
+
+def mac_to_int(mac):
+    """
+    Convert a MAC address to an integer. The formats accepted by netaddr are
+    supported: six groups of one or two hex digits separated by colons or
+    hyphens, three groups of up to four digits separated by colons, hyphens
+    or dots (Cisco format), two groups of up to six digits, or twelve digits
+    without separator. Integers are returned unchanged.
+
+    >>> mac_to_int('00:11:22:aa:bb:cc')
+    73596058572
+    >>> mac_to_int('00-11-22-AA-BB-CC')
+    73596058572
+    >>> mac_to_int('0011.22aa.bbcc')
+    73596058572
+
+    Raises:
+
+        ValueError: if the address is invalid.
+    """
+    if isinstance(mac, (int, long)):
+        return _check_range(mac, _MAX_MAC, 'MAC')
+    match = _MAC_RE.match(mac)
+    if match is not None:
+        return int(mac.replace(match.group(1), ''), 16)
+    for separator in (':', '-', '.'):
+        if separator in mac:
+            groups = mac.split(separator)
+            break
+    else:
+        separator = None
+        groups = [mac] if len(mac) == 12 else []
+    bits = 48 if len(groups) == 1 else _MAC_GROUPS.get(len(groups))
+    if bits is None or (separator == '.' and bits != 16):
+        raise ValueError('Invalid MAC address {}'.format(mac))
+    integer = 0
+    for group in groups:
+        if not 0 < len(group) <= bits // 4 \
+                or not _HEX_DIGITS.issuperset(group):
+            raise ValueError('Invalid MAC address {}'.format(mac))
+        integer = (integer << bits) | int(group, 16)
+    return integer
+
+
+def int_to_mac(integer):
+    """
+    Convert an integer to a MAC address.
+
+    >>> int_to_mac(73596058572)
+    '00-11-22-AA-BB-CC'
+
+    Raises:
+
+        ValueError: if the integer does not fit in 48 bits.
+    """
+    _check_range(integer, _MAX_MAC, 'MAC')
+    return _MAC_FORMAT.format(*'{:012X}'.format(integer))
+
+
+def ip4_to_int(address):
+    """
+    Convert an IPv4 address in dotted-quad notation to an integer. Shorthand
+    notations such as ``'10.1'`` are rejected. Integers are returned
+    unchanged.
+
+    >>> ip4_to_int('10.0.0.1')
+    167772161
+
+    Raises:
+
+        ValueError: if the address is invalid.
+    """
+    if isinstance(address, (int, long)):
+        return _check_range(address, _MAX_IP4, 'IPv4')
+    try:
+        return struct.unpack('!I', socket.inet_pton(socket.AF_INET,
+                                                    address))[0]
+    except (socket.error, TypeError):
+        raise ValueError('Invalid IPv4 address {}'.format(address))
+
+
+def int_to_ip4(integer):
+    """
+    Convert an integer to an IPv4 address.
+
+    >>> int_to_ip4(167772161)
+    '10.0.0.1'
+
+    Raises:
+
+        ValueError: if the integer does not fit in 32 bits.
+    """
+    _check_range(integer, _MAX_IP4, 'IPv4')
+    return socket.inet_ntoa(struct.pack('!I', integer))
+
+
+def macs_to_ints(macs):
+    """
+    Bulk variant of :func:`mac_to_int`. Return a list.
+    """
+    return [mac_to_int(mac) for mac in macs]
+
+
+def ints_to_macs(integers):
+    """
+    Bulk variant of :func:`int_to_mac`. Return a list.
+    """
+    integers = list(integers)
+    if integers and not 0 <= min(integers) <= max(integers) <= _MAX_MAC:
+        # find out which integer is invalid
+        return [int_to_mac(integer) for integer in integers]
+    mac_format = _MAC_FORMAT.format
+    return [mac_format(*'{:012X}'.format(integer)) for integer in integers]
+
+
+def ip4s_to_ints(addresses):
+    """
+    Bulk variant of :func:`ip4_to_int`. Return a list.
+    """
+    addresses = list(addresses)
+    if any(isinstance(address, (int, long)) for address in addresses):
+        return [ip4_to_int(address) for address in addresses]
+    inet_pton, af_inet = socket.inet_pton, socket.AF_INET
+    try:
+        packed = ''.join([inet_pton(af_inet, address)
+                          for address in addresses])
+    except (socket.error, TypeError):
+        # find out which address is invalid
+        return [ip4_to_int(address) for address in addresses]
+    return list(struct.unpack('!{}I'.format(len(addresses)), packed))
+
+
+def ints_to_ip4s(integers):
+    """
+    Bulk variant of :func:`int_to_ip4`. Return a list.
+    """
+    integers = list(integers)
+    try:
+        packed = struct.pack('!{}I'.format(len(integers)), *integers)
+    except struct.error:
+        # find out which integer is invalid
+        return [int_to_ip4(integer) for integer in integers]
+    inet_ntoa = socket.inet_ntoa
+    return [inet_ntoa(packed[i:i + 4]) for i in xrange(0, len(packed), 4)]
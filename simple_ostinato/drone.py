@@ -3,14 +3,41 @@ The module defines the ``Drone`` class, which is a wrapper for all the protocol
 buffer methods. It is usually the object to create when using
 ``ostinato-simple``:
 """
-from ostinato.core import DroneProxy
+import contextlib
+import Queue
+import threading
+import time
+from ostinato.core import DroneProxy, ost_pb
 from .port import Port
+from .stats import Stats
+from .stream import _load_protocols
+from . import rpc
+from . import utils
 
 
 global _DEBUG_PROTOBUF
 _DEBUG_PROTOBUF = False
 
 
+class ParallelError(Exception):
+
+    """
+    Raised when the operation performed by :meth:`Drone.save_all()` or
+    :meth:`Drone.fetch_all_streams()` failed for some ports. The operation is
+    still performed on all the other ports.
+
+    Attributes:
+
+        errors (list): list of ``(port, exception)`` tuples.
+    """
+
+    def __init__(self, errors):
+        self.errors = errors
+        message = '; '.join('{}: {}'.format(port, exc)
+                            for (port, exc) in errors)
+        super(ParallelError, self).__init__(message)
+
+
 class Drone(object):
     """Wrapper for ``ostinato.core.DroneProxy``.
 
@@ -24,61 +51,375 @@ class Drone(object):
         connect (bool): if True, attempt to connect to the remote instance when
             the object is initialized. Otherwise, it can be done manually later
             with :meth:`connect()`
+        cache_ttl (float): default value of the ``max_age`` argument of the
+            ``fetch`` methods of the drone, ports and streams, `i.e.` the
+            number of seconds during which a configuration fetched from the
+            remote drone instance is considered up to date and is not fetched
+            again. By default, it is 0, so the configuration is always
+            fetched.
+        pool_size (int): number of connections to the drone instance. The
+            first one is used for the control and statistics calls, and the
+            others for the calls that transfer large amounts of data (stream
+            configurations and captures), so that polling the statistics is
+            not delayed by a large transfer. A connection that is lost is
+            re-established automatically. It must be at least 1.
+
+    Attributes:
+
+        cache_ttl (float): see above. It can be changed at any time.
+
+    The drone, its ports and their streams can be used from several threads.
+    The calls sent over a given connection are sent one at a time, and each
+    port has its own lock, so that different ports can be configured in
+    parallel while the operations on a given port (and its streams) are
+    performed one after the other.
     """
 
-    def __init__(self, host, connect=True):
-        self._drone = DroneProxy(host)
+    def __init__(self, host, connect=True, cache_ttl=0, pool_size=1):
+        if pool_size < 1:
+            raise ValueError(
+                'pool_size must be at least 1, got {}'.format(pool_size))
+        self._lock = threading.RLock()
+        self._channels = [rpc.Channel(DroneProxy(host))]
+        self._channels.extend(rpc.Channel(self._new_proxy())
+                              for _ in range(pool_size - 1))
+        self._rpc = rpc.Dispatcher(self)
+        # extra connections used by save_all() and fetch_all_streams()
+        self._worker_channels = []
+        self.cache_ttl = cache_ttl
+        self._ports_last_check = None
         if connect is True:
             self.connect()
         self.ports = []
 
+    @property
+    def _drone(self):
+        """
+        The ``DroneProxy`` of the first connection.
+        """
+        return self._channels[0].proxy
+
+    @_drone.setter
+    def _drone(self, proxy):
+        self._channels[0].proxy = proxy
+
     def connect(self):
         """
         Connect to the remote drone instance. By default, it is already called
         when the object is created.
         """
-        self._drone.connect()
+        for channel in self._channels:
+            channel.connect()
 
     def disconnect(self):
         """
         Disconnect from the remote drone instance.
         """
-        self._drone.disconnect()
+        for channel in self._channels:
+            channel.disconnect()
+        self._close_worker_channels()
 
     def reconnect(self):
         """
-        Reconnect to the remote drone instance.
+        Reconnect to the remote drone instance. The configurations fetched
+        until now are not considered up to date anymore.
         """
-        self._drone.disconnect()
-        self._drone.connect()
+        self.disconnect()
+        self.connect()
+        self._invalidate_cache()
 
-    def fetch_ports(self):
+    @contextlib.contextmanager
+    def batch(self):
+        """
+        Context manager that defers the write calls to the drone instance
+        (streams creation, modification and deletion, ports modification,
+        statistics clearing) until the end of the block, and then sends them
+        in as few calls as possible: one call per type and per port.
+
+        Any other call performed inside the block (for instance
+        :meth:`start_send()` or :meth:`Port.fetch_streams()`) first sends the
+        pending calls, so the calls are still performed in order.
+
+            >>> with drone.batch():
+            ...     for port in drone.ports:
+            ...         port.add_streams(specs)
+            ...         port.transmit_mode = 'INTERLEAVED'
+            ...         port.save()
+            ...     drone.clear_stats()
+
+        If a call fails, a :class:`simple_ostinato.rpc.BatchError` is raised,
+        whose ``errors`` attribute tells which ports and streams caused the
+        errors. These ports and streams are considered modified again, so
+        that their next ``save()`` sends them.
+
+        If an exception is raised inside the block, the pending calls are
+        discarded, and the ports and streams they concern are considered
+        modified again. Streams that were added or deleted inside the block
+        are out of sync with the remote drone instance, and should be fetched
+        again.
+
+        Nested blocks are merged in the outermost one.
+        """
+        if self._rpc.in_batch:
+            yield
+            return
+        self._rpc.start_batch()
+        try:
+            try:
+                yield
+            except Exception:
+                self._rpc.end_batch(flush=False)
+                self._invalidate_cache()
+                raise
+            else:
+                self._rpc.end_batch()
+        finally:
+            # KeyboardInterrupt, SystemExit or GeneratorExit: the batch must
+            # not stay open, or all the following write calls of the thread
+            # would be queued forever
+            if self._rpc.in_batch:
+                self._rpc.end_batch(flush=False)
+                self._invalidate_cache()
+
+    def _invalidate_cache(self):
+        self._ports_last_check = None
+        for port in self.ports:
+            port._invalidate_cache()
+
+    @utils.synchronized
+    def fetch_ports(self, refresh=True, max_age=None):
         """
         Get the list of all the ports on the remote host. They are stored in
         the :attr:`ports` dictionnary.
+
+        Whatever the number of ports, this only performs two calls to the
+        drone instance: one to get the port IDs, and one to get all the port
+        configurations.
+
+        Args:
+
+            refresh (bool): if ``True``, the configuration of the ports that
+                are already known is refreshed. Otherwise, only the new ports
+                are added to :attr:`ports`.
+            max_age (float): if the ports have been fetched less than
+                ``max_age`` seconds ago, do nothing. Defaults to
+                :attr:`cache_ttl`.
         """
-        o_ports = self._drone.getPortConfig(self._drone.getPortIdList())
+        if max_age is None:
+            max_age = self.cache_ttl
+        if utils.is_fresh(self._ports_last_check, max_age):
+            return
+        o_ports = self._rpc.getPortConfig(self._rpc.getPortIdList())
+        self._ports_last_check = time.time()
         for o_port in o_ports.port:
-            port_id = o_port.port_id.id
-            port = self.get_port_by_id(port_id)
+            port = self.get_port_by_id(o_port.port_id.id)
             if port is None:
-                self.ports.append(Port(self, port_id))
-            else:
-                port.fetch()
+                self.ports.append(Port.from_protobuf(self, o_port))
+            elif refresh is True:
+                port._load(o_port)
+
+    @property
+    def ports(self):
+        """
+        The ports of the remote drone instance (see :meth:`fetch_ports()`).
+        This is a :class:`simple_ostinato.utils.Index`, which behaves like a
+        list, but is also indexed by port ID and by port name.
+        """
+        return self._ports
+
+    @ports.setter
+    def ports(self, value):
+        self._ports = utils.Index('port_id', value)
 
     def get_port_by_id(self, port_id):
-        for port in self.ports:
-            if port.port_id == port_id:
-                return port
+        """
+        Get a port from :attr:`ports` by ID. If the port is not found,
+        ``None`` is returned.
+        """
+        return self.ports.get(port_id)
 
     def get_port(self, name):
         """
         Get ports from :attr:`ports` by name. If the port is not found,
         ``None`` is returned.
         """
-        for port in self.ports:
-            if port.name == name:
-                return port
+        ports = self.ports.get_by_name(name)
+        if ports:
+            return ports[0]
+
+    def save_all(self, ports=None, workers=4, force=False):
+        """
+        Save several ports and their streams (see :meth:`Port.save()`) in
+        parallel, over up to ``workers`` connections to the drone instance.
+        Each port is saved by a single worker, so the calls for a given port
+        are still performed in order.
+
+        Args:
+
+            ports (list): :class:`Port` objects or port IDs. By default, all
+                the ports in :attr:`ports` are saved.
+            workers (int): maximum number of ports to save at the same time.
+                Each worker but the first one uses its own connection. These
+                connections are opened on first use, and kept open until
+                :meth:`disconnect()` is called.
+            force (bool): see :meth:`Port.save()`.
+
+        Raises:
+
+            ValueError: if a port ID is unknown. Nothing is saved in that
+                case.
+            ParallelError: if some ports could not be saved.
+        """
+        self._for_each_port(lambda port: port.save(force=force),
+                            ports, workers)
+
+    def fetch_all_streams(self, ports=None, workers=4, max_age=None):
+        """
+        Fetch the streams of several ports (see :meth:`Port.fetch_streams()`)
+        in parallel. See :meth:`save_all()`.
+        """
+        # import the protocols before any worker parses a stream
+        _load_protocols()
+        self._for_each_port(lambda port: port.fetch_streams(max_age=max_age),
+                            ports, workers)
+
+    def _new_proxy(self):
+        """
+        Return a new ``DroneProxy`` for the drone instance. It is not
+        connected yet.
+        """
+        return DroneProxy(self._drone.host)
+
+    @utils.synchronized
+    def _get_worker_channels(self, count):
+        """
+        Return ``count`` extra :class:`simple_ostinato.rpc.Channel` objects,
+        opening the missing ones.
+        """
+        while len(self._worker_channels) < count:
+            channel = rpc.Channel(self._new_proxy())
+            channel.connect()
+            self._worker_channels.append(channel)
+        return self._worker_channels[:count]
+
+    @utils.synchronized
+    def _close_worker_channels(self):
+        channels, self._worker_channels = self._worker_channels, []
+        for channel in channels:
+            channel.disconnect()
+
+    def _for_each_port(self, function, ports, workers):
+        """
+        Call ``function(port)`` for the given ports, from up to ``workers``
+        threads that each have their own connection to the drone instance.
+        """
+        if ports is None:
+            ports = list(self.ports)
+        else:
+            ports = [self._resolve_port(port) for port in ports]
+        if not ports:
+            return
+        # the calls queued by the current thread must be sent first
+        self._rpc.flush()
+        workers = max(1, min(workers, len(ports)))
+        channels = Queue.Queue()
+        # ``None`` stands for the main connection
+        channels.put(None)
+        for channel in self._get_worker_channels(workers - 1):
+            channels.put(channel)
+
+        def call(port):
+            channel = channels.get()
+            try:
+                with self._rpc.use_channel(channel):
+                    function(port)
+            finally:
+                channels.put(channel)
+
+        outcomes = utils.parallel_map(call, ports, workers)
+        errors = [(port, exc) for port, (_, exc) in zip(ports, outcomes)
+                  if exc is not None]
+        if errors:
+            raise ParallelError(errors)
+
+    def _resolve_port(self, port):
+        """
+        Return the :class:`Port` object for ``port``, which is either a
+        :class:`Port` or a port ID.
+        """
+        if not isinstance(port, (int, long)):
+            return port
+        port_object = self.get_port_by_id(port)
+        if port_object is None:
+            raise ValueError('No port with ID {}'.format(port))
+        return port_object
+
+    def _get_o_port_id_list(self, ports=None):
+        if ports is None:
+            ports = self.ports
+        o_port_ids = ost_pb.PortIdList()
+        for port in ports:
+            if isinstance(port, Port):
+                port = port.port_id
+            o_port_ids.port_id.add().id = port
+        return o_port_ids
+
+    def start_send(self, ports=None):
+        """
+        Start transmitting on several ports at once. Since all the ports are
+        handled by a single call to the drone instance, they start
+        transmitting (almost) simultaneously.
+
+        Args:
+
+            ports (list): :class:`Port` objects or port IDs. By default, all
+                the ports in :attr:`ports` are used.
+        """
+        self._rpc.startTransmit(self._get_o_port_id_list(ports))
+
+    def stop_send(self, ports=None):
+        """
+        Stop transmitting on several ports at once. See :meth:`start_send()`.
+        """
+        self._rpc.stopTransmit(self._get_o_port_id_list(ports))
+
+    def start_capture(self, ports=None):
+        """
+        Start capturing on several ports at once. See :meth:`start_send()`.
+        """
+        self._rpc.startCapture(self._get_o_port_id_list(ports))
+
+    def stop_capture(self, ports=None):
+        """
+        Stop capturing on several ports at once. See :meth:`start_send()`.
+        """
+        self._rpc.stopCapture(self._get_o_port_id_list(ports))
+
+    def clear_stats(self, ports=None):
+        """
+        Clear the statistics of several ports at once. See
+        :meth:`start_send()`.
+        """
+        self._rpc.clearStats(self._get_o_port_id_list(ports))
+
+    def get_stats(self, ports=None):
+        """
+        Fetch the statistics of several ports with a single call to the drone
+        instance.
+
+        Args:
+
+            ports (list): :class:`Port` objects or port IDs. By default, all
+                the ports in :attr:`ports` are used.
+
+        Returns:
+
+            :class:`simple_ostinato.stats.Stats`: the statistics, stored by
+            column. Use :meth:`Stats.to_dicts()
+            <simple_ostinato.stats.Stats.to_dicts>` to get them as
+            dictionaries.
+        """
+        return Stats(self._rpc.getStats(self._get_o_port_id_list(ports)))
 
     def __str__(self):
         return 'drone({})'.format(self._drone.host)
@@ -1,50 +1,34 @@
 import os
 from jinja2 import Environment, PackageLoader
-from ostinato.core import ost_pb
 from . import constants
+from .protocols import baseclass
 
 
 class _Generator(object):
 
-    class Attribute(object):
-
-        def __init__(self, name, offset, default_value, full_mask, mask, ext_name, override, doc):
-            self.name = name
-            self.offset = offset
-            self.default_value = default_value
-            self.mask = mask
-            self.ext_name = ext_name
-            if override:
-                self.auto = True
-                self.ext_override = override
-                doc = '{}. By default, this attribute is set automatically. Set :attr:`{}_override` to ``True`` to override this field'.format(doc, name)
-            else:
-                self.auto = False
-                self.ext_override = None
-            self.doc = doc
-            if mask == 0:
-                self.shift = 0
-            else:
-                shift = 0
-                while (mask >> shift) % 2 == 0:
-                    shift += 1
-                self.shift = shift
-            self.full_mask = full_mask
-            if self.full_mask > 0xffff:
-                self.counter = ost_pb.VariableField.kCounter32
-            elif self.full_mask > 0xff:
-                self.counter = ost_pb.VariableField.kCounter16
-            else:
-                self.counter = ost_pb.VariableField.kCounter8
-
     def __init__(self, attributes, class_name=None, protocol_id=None, extension=None, doc=None):
         self.class_name = class_name
         self.protocol_id = protocol_id
         self.extension = extension
         self.doc = doc
+        # the fields are described by a table in the generated classes, and
+        # the generated _save() and _fetch() use the Field objects built from
+        # this table (see simple_ostinato.protocols.baseclass.Field). The
+        # layout of the state is computed here: one entry per extension
+        # field, and then four entries (mode, step, count, override) per
+        # field.
+        attributes = sorted(attributes.iteritems())
+        value_indices = {}
+        for _, attribute in attributes:
+            value_indices.setdefault(attribute[4], len(value_indices))
+        index = len(value_indices)
+        self.fields = []
         self.attributes = []
-        for attribute_name, attribute in attributes.iteritems():
-            self.attributes.append(self.Attribute(attribute_name, *attribute))
+        for attribute_name, attribute in attributes:
+            entry = (attribute_name, ) + attribute + (value_indices[attribute[4]], index)
+            self.fields.append(repr(entry))
+            self.attributes.append(baseclass.Field(*entry))
+            index += 4
 
 
 def generate_classes():
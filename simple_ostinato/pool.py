@@ -0,0 +1,199 @@
+"""
+This module defines the ``DronePool`` class, which drives several drone
+instances at once.
+"""
+import collections
+from .drone import Drone
+from . import utils
+
+
+class PoolError(Exception):
+
+    """
+    Raised when an operation failed on some of the drone instances of a
+    :class:`DronePool`. The operation is still performed on all the other
+    instances.
+
+    Attributes:
+
+        errors (dict): the exceptions raised, by host.
+        results (dict): the results of the hosts that did not fail, by host.
+    """
+
+    def __init__(self, errors, results):
+        self.errors = errors
+        self.results = results
+        message = '; '.join('{}: {}'.format(host, exc)
+                            for host, exc in errors.iteritems())
+        super(PoolError, self).__init__(message)
+
+
+class DronePool(object):
+
+    """
+    Group of :class:`Drone` objects, whose operations are performed in
+    parallel by a bounded number of worker threads (one operation at a time
+    per drone instance).
+
+    The ports of all the drone instances are available in a single namespace,
+    in which they are named ``<host>:<port name>``:
+
+        >>> pool = DronePool(['10.0.0.1', '10.0.0.2'])
+        >>> pool.fetch_ports()
+        >>> ports = [pool.get_port('10.0.0.1:eth0'),
+        ...          pool.get_port('10.0.0.2:eth0')]
+        >>> pool.clear_stats(ports)
+        >>> pool.start_send(ports)
+
+    If an operation fails on some of the drone instances, a
+    :class:`PoolError` is raised once it is done on all the instances.
+
+    Args:
+
+        hosts (list): the hosts running the drone instances.
+        connect (bool): if ``True``, connect to all the drone instances when
+            the object is initialized. Otherwise, it can be done manually
+            later with :meth:`connect()`
+        workers (int): maximum number of drone instances to talk to at the
+            same time.
+        kwargs: other arguments for :class:`Drone` (except ``connect``)
+
+    Attributes:
+
+        drones (OrderedDict): the :class:`Drone` objects, by host.
+        workers (int): see above. It can be changed at any time.
+    """
+
+    def __init__(self, hosts, connect=True, workers=8, **kwargs):
+        self.drones = collections.OrderedDict(
+            (host, Drone(host, connect=False, **kwargs)) for host in hosts)
+        self.workers = workers
+        if connect is True:
+            self.connect()
+
+    def _map(self, function, hosts=None):
+        """
+        Call ``function(drone)`` for the drones of the given hosts (all of
+        them by default), in parallel, and return the results by host.
+        """
+        if hosts is None:
+            hosts = self.drones.keys()
+        outcomes = utils.parallel_map(
+            lambda host: function(self.drones[host]), hosts, self.workers)
+        results = collections.OrderedDict()
+        errors = collections.OrderedDict()
+        for host, (result, exc) in zip(hosts, outcomes):
+            if exc is None:
+                results[host] = result
+            else:
+                errors[host] = exc
+        if errors:
+            raise PoolError(errors, results)
+        return results
+
+    def _map_ports(self, function, ports):
+        """
+        Call ``function(drone, drone_ports)`` in parallel for the drones
+        ``ports`` belong to. If ``ports`` is ``None``, call
+        ``function(drone, None)`` for all the drones.
+        """
+        if ports is None:
+            return self._map(lambda drone: function(drone, None))
+        hosts = collections.OrderedDict()
+        for port in ports:
+            if not hasattr(port, 'port_id'):
+                name = port
+                port = self.get_port(name)
+                if port is None:
+                    raise ValueError('No port {}'.format(name))
+            hosts.setdefault(self._get_host(port._parent), []).append(port)
+        return self._map(
+            lambda drone: function(drone, hosts[self._get_host(drone)]),
+            hosts.keys())
+
+    def _get_host(self, drone):
+        for host, pool_drone in self.drones.iteritems():
+            if pool_drone is drone:
+                return host
+        raise ValueError('{} does not belong to the pool'.format(drone))
+
+    def connect(self):
+        """
+        Connect to all the drone instances. By default, it is already called
+        when the object is created.
+        """
+        self._map(lambda drone: drone.connect())
+
+    def disconnect(self):
+        """
+        Disconnect from all the drone instances.
+        """
+        self._map(lambda drone: drone.disconnect())
+
+    def fetch_ports(self, refresh=True, max_age=None):
+        """
+        Fetch the ports of all the drone instances. See
+        :meth:`Drone.fetch_ports()`.
+        """
+        self._map(lambda drone: drone.fetch_ports(refresh=refresh,
+                                                  max_age=max_age))
+
+    @property
+    def ports(self):
+        """
+        All the ports of the drone instances, as an ``OrderedDict`` whose keys
+        are ``<host>:<port name>``.
+        """
+        ports = collections.OrderedDict()
+        for host, drone in self.drones.iteritems():
+            for port in drone.ports:
+                ports['{}:{}'.format(host, port.name)] = port
+        return ports
+
+    def get_port(self, name):
+        """
+        Get a port by its ``<host>:<port name>`` name. If the port is not
+        found, ``None`` is returned.
+        """
+        for host, drone in self.drones.iteritems():
+            prefix = '{}:'.format(host)
+            if name.startswith(prefix):
+                return drone.get_port(name[len(prefix):])
+
+    def start_send(self, ports=None):
+        """
+        Start transmitting on several ports. The ports of a given drone
+        instance are started with a single call, and the drone instances are
+        called in parallel.
+
+        Args:
+
+            ports (list): :class:`Port` objects or ``<host>:<port name>``
+                names. By default, all the ports of all the drone instances
+                are used.
+        """
+        self._map_ports(lambda drone, ports: drone.start_send(ports), ports)
+
+    def stop_send(self, ports=None):
+        """
+        Stop transmitting on several ports. See :meth:`start_send()`.
+        """
+        self._map_ports(lambda drone, ports: drone.stop_send(ports), ports)
+
+    def clear_stats(self, ports=None):
+        """
+        Clear the statistics of several ports. See :meth:`start_send()`.
+        """
+        self._map_ports(lambda drone, ports: drone.clear_stats(ports), ports)
+
+    def get_stats(self, ports=None):
+        """
+        Fetch the statistics of several ports. See :meth:`start_send()`.
+
+        Returns:
+
+            OrderedDict: the :class:`simple_ostinato.stats.Stats` of each
+            drone instance, by host.
+        """
+        return self._map_ports(lambda drone, ports: drone.get_stats(ports),
+                               ports)
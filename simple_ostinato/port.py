@@ -2,8 +2,14 @@
 This module implement a class that represents a remote port, controlled by a
 :class:`Drone` instance.
 """
+import collections
+import copy
+import threading
+import time
 from ostinato.core import ost_pb
-from .stream import Stream
+from .stream import Stream, _load_protocols
+from . import rpc
+from . import stats
 from . import utils
 
 
@@ -21,25 +27,62 @@ class Port(object):
 
     Attributes:
 
-        streams (dict): a dictionnary with all the streams configured on this
-            port. It can be refreshed with :meth:`fetch_streams()`.
+        streams (:class:`simple_ostinato.utils.Index`): all the streams
+            configured on this port. It behaves like a list, but is also
+            indexed by stream ID and by stream name. It can be refreshed with
+            :meth:`fetch_streams()`.
         port_id (int): id of the port
+        last_check (float): time at which the port configuration was last
+            fetched from the remote drone instance, or ``None`` if it must be
+            fetched again.
     """
 
-    def __init__(self, drone, port_id):
-        self._drone = drone._drone
+    def __init__(self, drone, port_id, o_port=None):
+        # protects the port configuration and its streams
+        self._lock = threading.RLock()
+        self._parent = drone
+        self._drone = drone._rpc
         self.port_id = port_id
         self.streams = []
-        self.fetch()
+        if o_port is None:
+            self.fetch()
+        else:
+            self._load(o_port)
+
+    @classmethod
+    def from_protobuf(cls, drone, o_port):
+        """
+        Create a :class:`Port` from an ``ost_pb.Port`` message that has
+        already been retrieved from the drone instance. Unlike the regular
+        constructor, this does not perform any call to the drone instance.
+
+        Args:
+
+            drone (:class:`Drone`): an object that wraps the underlying
+                protocol buffer calls.
+            o_port (``ost_pb.Port``): the port configuration.
+        """
+        return cls(drone, o_port.port_id.id, o_port=o_port)
+
+    @property
+    def streams(self):
+        return self._streams
+
+    @streams.setter
+    def streams(self, value):
+        with self._lock:
+            self._streams = utils.Index('stream_id', value)
+            self._stream_id_allocator = utils.IdAllocator(
+                self._streams.ids())
+            # the streams no longer match what was fetched
+            self._streams_last_check = None
 
     def get_stream(self, stream_id):
         """
         Return a the :class:`Stream` object corresponding to the given stream
         ID (:class:`int`)
         """
-        for stream in self.streams:
-            if stream.stream_id == stream_id:
-                return stream
+        return self.streams.get(stream_id)
 
     def get_streams_by_name(self, name):
         """
@@ -49,40 +92,159 @@ class Port(object):
 
             >>> my_stream_foo = my_port.get_streams_by_name('stream_foo')[0]
         """
-        streams = []
-        for stream in self.streams:
-            if stream.name == name:
-                streams.append(stream)
-        return streams
+        return self.streams.get_by_name(name)
 
     def _fetch(self):
         o_ports = self._drone.getPortConfig(self._get_o_port_id_list())
         return o_ports
 
-    def save(self):
+    def _dump(self, o_port):
         """
-        Save the current port configuration on the remote drone instance.
+        Write the port configuration in the given ``ost_pb.Port`` message.
         """
-        o_ports = self._fetch()
-        o_port = o_ports.port[0]
         o_port.name = self._name
         o_port.is_enabled = self._is_enabled
         o_port.transmit_mode = self._transmit_mode
         o_port.user_name = self._user_name
-        for stream in self.streams:
-            stream.save()
-        self._drone.modifyPort(o_ports)
 
-    def fetch(self):
+    @utils.synchronized
+    def _load(self, o_port):
         """
-        Fetch the current port configuration from the remote drone instance.
+        Read the port configuration from the given ``ost_pb.Port`` message. A
+        copy of the message is kept, so that the fields that are not handled
+        by this class are preserved when the port is saved.
         """
-        o_port = self._fetch().port[0]
+        self.last_check = time.time()
+        self._o_port = ost_pb.Port()
+        self._o_port.CopyFrom(o_port)
+        old_name = self.name
         self._name = o_port.name
         self._is_enabled = o_port.is_enabled
         self._transmit_mode = o_port.transmit_mode
         self._user_name = o_port.user_name
         self._is_exclusive_control = o_port.is_exclusive_control
+        self._dirty = False
+        self._parent.ports.rename(self, old_name)
+
+    @utils.synchronized
+    def _save_streams(self, streams):
+        """
+        Save the given streams with a single ``modifyStream`` call.
+        """
+        o_streams = ost_pb.StreamConfigList()
+        o_streams.port_id.id = self.port_id
+        for stream in streams:
+            stream._save_to(o_streams)
+        self._drone.modifyStream(o_streams)
+        for stream, o_stream in zip(streams, o_streams.stream):
+            stream._mark_saved(o_stream)
+
+    def _max_age(self, max_age):
+        if max_age is None:
+            return self._parent.cache_ttl
+        return max_age
+
+    def _streams_are_fresh(self, max_age):
+        if not utils.is_fresh(self._streams_last_check, max_age):
+            return False
+        for stream in self.streams:
+            if not utils.is_fresh(stream.last_check, max_age):
+                return False
+        return True
+
+    def _invalidate_cache(self):
+        self.last_check = None
+        self._streams_last_check = None
+        for stream in self.streams:
+            stream.last_check = None
+
+    @utils.synchronized
+    def save(self, force=False):
+        """
+        Save the current port configuration on the remote drone instance,
+        including all the streams. This is performed with one call to save
+        all the streams, and one call to save the port configuration. To save
+        a single stream, use :meth:`Stream.save()`.
+
+        Only the streams that have been modified since they were last saved
+        or fetched are sent, and the port configuration is only sent if it
+        has been modified, so saving an unchanged port does not perform any
+        call to the drone instance.
+
+        Args:
+
+            force (bool): if ``True``, save the port and all its streams even
+                if they have not been modified.
+        """
+        streams = [stream for stream in self.streams
+                   if force or stream._is_dirty()]
+        if streams:
+            self._save_streams(streams)
+        if force or self._dirty:
+            o_ports = ost_pb.PortConfigList()
+            o_port = o_ports.port.add()
+            o_port.CopyFrom(self._o_port)
+            self._dump(o_port)
+            self._drone.modifyPort(o_ports)
+            self._o_port.CopyFrom(o_port)
+            self._dirty = False
+            self.last_check = None
+
+    @utils.synchronized
+    def fetch(self, max_age=None):
+        """
+        Fetch the current port configuration from the remote drone instance.
+
+        Args:
+
+            max_age (float): if the configuration has been fetched less than
+                ``max_age`` seconds ago, and has not been saved since, do
+                nothing. Defaults to :attr:`Drone.cache_ttl`.
+        """
+        if utils.is_fresh(self.last_check, self._max_age(max_age)):
+            return
+        self._load(self._fetch().port[0])
+
+    def _allocate_stream_ids(self, count):
+        """
+        Return ``count`` unused stream IDs. If a previous call failed in a
+        way that leaves the stream IDs in use on the drone instance unknown,
+        they are fetched first.
+        """
+        if self._stream_id_allocator is None:
+            o_stream_ids = self._fetch_stream_ids()
+            used_ids = set(self.streams.ids())
+            used_ids.update(o_stream_id.id
+                            for o_stream_id in o_stream_ids.stream_id)
+            self._stream_id_allocator = utils.IdAllocator(used_ids)
+        return self._stream_id_allocator.allocate_many(count)
+
+    def _release_stream_ids(self, stream_ids):
+        if self._stream_id_allocator is not None:
+            for stream_id in stream_ids:
+                self._stream_id_allocator.release(stream_id)
+
+    def _add_stream_ids(self, stream_ids):
+        """
+        Create streams with the given IDs on the drone instance. If the call
+        fails, the IDs are released, unless the connection was lost: the
+        streams may have been created anyway, so the IDs in use are fetched
+        again before the next allocation.
+        """
+        o_stream_ids = ost_pb.StreamIdList()
+        o_stream_ids.port_id.id = self.port_id
+        for stream_id in stream_ids:
+            o_stream_ids.stream_id.add().id = stream_id
+        try:
+            self._drone.addStream(o_stream_ids)
+        except rpc.Channel.CONNECTION_ERRORS:
+            self._stream_id_allocator = None
+            raise
+        except Exception:
+            self._release_stream_ids(stream_ids)
+            raise
+        finally:
+            self._streams_last_check = None
 
     def _fetch_stream_ids(self):
         o_port_ids = ost_pb.PortIdList()
@@ -92,21 +254,37 @@ class Port(object):
 
     def _fetch_streams(self):
         o_stream_ids = self._fetch_stream_ids()
+        _load_protocols()
         return self._drone.getStreamConfig(o_stream_ids)
 
-    def fetch_streams(self):
+    @utils.synchronized
+    def fetch_streams(self, max_age=None):
         """
         Fetch the streams configured on this port, from the remote drone
         instance. The streams are stored in :attr:`streams`.
+
+        Whatever the number of streams, this only performs two calls to the
+        drone instance: one to get the stream IDs, and one to get all the
+        stream configurations.
+
+        Args:
+
+            max_age (float): if the streams have been fetched less than
+                ``max_age`` seconds ago, and no stream has been added, saved or
+                deleted since, do nothing. Defaults to
+                :attr:`Drone.cache_ttl`.
         """
+        if self._streams_are_fresh(self._max_age(max_age)):
+            return
         o_streams = self._fetch_streams()
+        self._streams_last_check = time.time()
         for o_stream in o_streams.stream:
-            stream_id = o_stream.stream_id.id
-            stream = self.get_stream(stream_id)
+            stream = self.get_stream(o_stream.stream_id.id)
             if stream is None:
-                self.streams.append(Stream(self, stream_id))
+                self.streams.append(Stream.from_protobuf(self, o_stream))
             else:
-                stream.fetch()
+                stream._load(o_stream)
+        self._stream_id_allocator = utils.IdAllocator(self.streams.ids())
 
     @property
     def port_id(self):
@@ -166,6 +344,7 @@ class Port(object):
     @transmit_mode.setter
     def transmit_mode(self, value):
         self._transmit_mode = self._TransmitMode.get_value(value)
+        self._dirty = True
 
     @property
     def user_name(self):
@@ -177,13 +356,104 @@ class Port(object):
     @user_name.setter
     def user_name(self, value):
         self._user_name = str(value)
+        self._dirty = True
+
+    @utils.synchronized
+    def set_field(self, streams, field, values):
+        """
+        Set the same field of many streams at once. For the layers fields,
+        integer values (in particular NumPy integer arrays) are masked and
+        written directly in all the layers in a single pass, without going
+        through the attributes setters.
+
+        The streams are not saved: :meth:`save()` pushes all the modified
+        streams with a single call to the drone instance.
 
-    def _get_new_stream_id(self):
-        new_id = 0
-        while self.get_stream(new_id) is not None:
-            new_id += 1
-        return new_id
+        Args:
+
+            streams (list): :class:`Stream` objects or stream IDs.
+            field (str): either a stream attribute (for instance
+                ``'num_packets'``), or a layer attribute, given as
+                ``'<layer class name>.<attribute>'`` (for instance
+                ``'IPv4.destination'``). Each stream must have such a layer.
+            values: a sequence or a NumPy array with one value per stream.
+                A single value is used for all the streams. Like with the
+                attributes setters, integers that do not fit in a field are
+                masked, except for the MAC and IPv4 addresses, that must be
+                in range.
+
+            >>> streams = my_port.streams
+            >>> my_port.set_field(streams, 'IPv4.destination',
+            ...                   range(0x0a000001, 0x0a000001 + len(streams)))
+            >>> my_port.set_field(streams, 'Udp.source', 1234)
+            >>> my_port.save()
+
+        Raises:
+
+            ValueError: if a stream ID is unknown, if a stream belongs to
+                another port, if a stream does not have the given layer, or
+                if a value is invalid.
+        """
+        streams = [self._resolve_stream(stream) for stream in streams]
+        if isinstance(values, basestring) or not hasattr(values, '__iter__'):
+            values = [values] * len(streams)
+        elif not hasattr(values, '__len__'):
+            values = list(values)
+        if len(values) != len(streams):
+            raise ValueError('Got {} values for {} streams'.format(
+                len(values), len(streams)))
+        if '.' not in field:
+            for stream, value in zip(streams, values):
+                setattr(stream, field, value)
+            return
+        layer_name, attribute = field.split('.', 1)
+        layers = [stream.get_layer(layer_name) for stream in streams]
+        # the layers that have the same name may not have the same class (for
+        # instance a subclass defined by the user)
+        indices_by_class = collections.OrderedDict()
+        for index, layer in enumerate(layers):
+            indices_by_class.setdefault(type(layer), []).append(index)
+        if len(indices_by_class) == 1:
+            type(layers[0])._set_many(layers, attribute, values)
+            return
+        for layer_class, indices in indices_by_class.iteritems():
+            if hasattr(values, 'dtype'):
+                class_values = values[indices]
+            else:
+                class_values = [values[index] for index in indices]
+            layer_class._set_many([layers[index] for index in indices],
+                                  attribute, class_values)
+
+    def _resolve_stream(self, stream):
+        """
+        Return the :class:`Stream` object for the given stream or stream ID,
+        and check that it belongs to this port.
+        """
+        if isinstance(stream, (int, long)):
+            stream_id, stream = stream, self.get_stream(stream)
+            if stream is None:
+                raise ValueError('No stream with ID {}'.format(stream_id))
+        elif stream._parent is not self:
+            raise ValueError('{} is not a stream of {}'.format(stream, self))
+        return stream
+
+    def table(self, streams=None):
+        """
+        Return a columnar view of the streams, as a
+        :class:`simple_ostinato.table.StreamTable`.
 
+        Args:
+
+            streams (list): the :class:`Stream` objects to include. By
+                default, all the streams of :attr:`streams`.
+        """
+        # imported here because it imports NumPy, which is slow to import
+        from .table import StreamTable
+        if streams is None:
+            streams = self.streams
+        return StreamTable(self, streams)
+
+    @utils.synchronized
     def add_stream(self, *layers):
         """
         Create a new stream, on the remote drone instance, and return the
@@ -195,16 +465,70 @@ class Port(object):
             >>> from simple_ostinato import protocols
             >>> my_port.add_stream(protocols.Mac(), protocols.Ethernet())
         """
-        o_stream_ids = ost_pb.StreamIdList()
-        o_stream_ids.port_id.id = self.port_id
-        stream_id = self._get_new_stream_id()
-        o_stream_ids.stream_id.add().id = stream_id
-        self._drone.addStream(o_stream_ids)
-        new_stream = Stream(self, stream_id)
+        stream_id, = self._allocate_stream_ids(1)
+        self._add_stream_ids([stream_id])
+        # a freshly added stream has the default configuration, so there is no
+        # need to fetch it.
+        o_stream = ost_pb.Stream()
+        o_stream.stream_id.id = stream_id
+        new_stream = Stream.from_protobuf(self, o_stream)
         self.streams.append(new_stream)
         new_stream.layers = list(layers)
         return new_stream
 
+    @utils.synchronized
+    def add_streams(self, specs):
+        """
+        Create several streams at once, and return the corresponding list of
+        :class:`Stream` objects. The objects are also added to
+        :attr:`streams`.
+
+        All the stream IDs are reserved with a single ``addStream`` call, and
+        all the configurations are pushed with a single ``modifyStream`` call,
+        so this is much faster than calling :meth:`add_stream()` and
+        :meth:`Stream.save()` in a loop.
+
+        Args:
+
+            specs (list): each item describes a stream, and is either a list
+                of layers (like the arguments of :meth:`add_stream()`), or a
+                dictionary as returned by :meth:`Stream.to_dict()`. The
+                layers are copied, so each stream gets its own layer objects,
+                even if the same list is used for several streams.
+
+            >>> from simple_ostinato import protocols
+            >>> my_port.add_streams([
+            ...     [protocols.Mac(), protocols.Ethernet()],
+            ...     {'name': 'foo', 'num_packets': 10, 'layers': []}])
+
+        If the configurations cannot be pushed, the new streams are still in
+        :attr:`streams`, and :meth:`save()` pushes their configuration.
+        """
+        specs = list(specs)
+        if not specs:
+            return []
+        stream_ids = self._allocate_stream_ids(len(specs))
+        self._add_stream_ids(stream_ids)
+
+        new_streams = []
+        for stream_id, spec in zip(stream_ids, specs):
+            # a freshly added stream has the default configuration, so there
+            # is no need to fetch it.
+            o_stream = ost_pb.Stream()
+            o_stream.stream_id.id = stream_id
+            stream = Stream.from_protobuf(self, o_stream)
+            if isinstance(spec, dict):
+                stream.from_dict(spec)
+            else:
+                stream.layers = copy.deepcopy(list(spec))
+            new_streams.append(stream)
+        # the streams exist on the drone instance from now on, even if their
+        # configuration cannot be pushed: in this case, save() pushes it
+        # again.
+        self.streams.extend(new_streams)
+        self._save_streams(new_streams)
+        return new_streams
+
     def del_stream(self, stream_id):
         """
         Delete the stream provided as argument.
@@ -213,11 +537,65 @@ class Port(object):
 
             stream_id (int): id of the stream to delete from the port.
         """
+        self.del_streams([stream_id])
+
+    @utils.synchronized
+    def del_streams(self, stream_ids):
+        """
+        Delete several streams at once, with a single call to the drone
+        instance.
+
+        Args:
+
+            stream_ids (list): ids of the streams to delete from the port.
+                An ID given several times is only deleted once.
+
+        Raises:
+
+            ValueError: if one of the IDs is not the ID of a stream of
+                :attr:`streams`. In this case, nothing is deleted.
+        """
+        streams = []
+        seen = set()
+        for stream_id in stream_ids:
+            if stream_id in seen:
+                continue
+            seen.add(stream_id)
+            stream = self.get_stream(stream_id)
+            if stream is None:
+                raise ValueError('No stream with ID {}'.format(stream_id))
+            streams.append(stream)
+        if not streams:
+            return
         o_stream_ids = ost_pb.StreamIdList()
         o_stream_ids.port_id.id = self.port_id
-        o_stream_ids.stream_id.add().id = stream_id
+        for stream in streams:
+            o_stream_ids.stream_id.add().id = stream.stream_id
         self._drone.deleteStream(o_stream_ids)
-        self.streams.remove(self.get_stream(stream_id))
+        self._streams_last_check = None
+        for stream in streams:
+            self.streams.remove(stream)
+        self._release_stream_ids([stream.stream_id for stream in streams])
+
+    @utils.synchronized
+    def replace_streams(self, specs):
+        """
+        Delete all the streams configured on this port, and create new ones.
+        Whatever the number of streams, this performs at most three calls to
+        the drone instance (``deleteStream``, ``addStream`` and
+        ``modifyStream``).
+
+        Args:
+
+            specs (list): description of the new streams. See
+                :meth:`add_streams()`.
+
+        Returns:
+
+            list: the new :class:`Stream` objects.
+        """
+        self.del_streams(self.streams.ids())
+        return self.add_streams(specs)
 
     def start_send(self):
         """
@@ -262,17 +640,14 @@ class Port(object):
                 'user_name': self.user_name,
                 'streams': stream_dicts}
 
+    @utils.synchronized
     def from_dict(self, values):
         read_only = ['name', 'is_exclusive_control', 'user_name', 'is_enabled']
         for key, value in values.iteritems():
             if key in read_only:
                 pass
             elif key == 'streams':
-                while self.streams:
-                    self.del_stream(self.streams[0].stream_id)
-                for stream_dict in value:
-                    stream = self.add_stream()
-                    stream.from_dict(stream_dict)
+                self.replace_streams(value)
             else:
                 setattr(self, key, value)
 
@@ -282,24 +657,8 @@ class Port(object):
         """
         o_stats = self._drone.getStats(self._get_o_port_id_list())
         o_stats = o_stats.port_stats[0]
-        return {
-            'rx_bps': o_stats.rx_bps,
-            'rx_bytes': o_stats.rx_bytes,
-            'rx_bytes_nic': o_stats.rx_bytes_nic,
-            'rx_drops': o_stats.rx_drops,
-            'rx_errors': o_stats.rx_errors,
-            'rx_fifo_errors': o_stats.rx_fifo_errors,
-            'rx_frame_errors': o_stats.rx_frame_errors,
-            'rx_pkts': o_stats.rx_pkts,
-            'rx_pkts_nic': o_stats.rx_pkts_nic,
-            'rx_pps': o_stats.rx_pps,
-            'tx_bps': o_stats.tx_bps,
-            'tx_bytes': o_stats.tx_bytes,
-            'tx_bytes_nic': o_stats.tx_bytes_nic,
-            'tx_pkts': o_stats.tx_pkts,
-            'tx_pkts_nic': o_stats.tx_pkts_nic,
-            'tx_pps': o_stats.tx_pps,
-        }
+        return dict((counter, getattr(o_stats, counter))
+                    for counter in stats.COUNTERS)
 
     def get_capture(self, save_as=None):
         """
@@ -311,7 +670,8 @@ class Port(object):
                 pcap file at the specified location `on the host that runs \
                 drone`.
         """
-        o_port_id = self._fetch().port[0].port_id
+        o_port_id = ost_pb.PortId()
+        o_port_id.id = self.port_id
         o_buff = self._drone.getCaptureBuffer(o_port_id)
         if save_as:
             self.save_capture(o_buff, save_as)
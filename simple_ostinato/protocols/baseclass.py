@@ -1,4 +1,5 @@
 from ostinato.core import ost_pb
+import importlib
 import inspect
 from .. import utils
 """
@@ -29,7 +30,7 @@ def make_protocol_class(name, bases, attributes):
             if cls.__doc__ is not None:
                 attributes['__doc__'] = cls.__doc__
                 break
-    return type(name, bases, attributes)
+    return ProtocolType(name, bases, attributes)
     # return fix_docs(my_cls)
 
 
@@ -40,32 +41,400 @@ class FieldMode(utils.Enum):
     RANDOM = ost_pb.VariableField.kRandom
 
 
+def _import_module(name):
+    return importlib.import_module('ostinato.protocols.{}'.format(name))
+
+
+class Extension(object):
+
+    """
+    Protocol buffer extension of a protocol, given as ``'<module>.<name>'``
+    where ``<module>`` is a module of ``ostinato.protocols``. The module is
+    only imported the first time the extension is used, or when
+    :meth:`load()` is called.
+
+    On an instance, the attribute is the extension itself. On the class, it
+    is this object.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._extension = None
+
+    def load(self):
+        """
+        Import the module of the extension if it is not done yet, and return
+        the extension.
+        """
+        if self._extension is None:
+            module_name, name = self.path.split('.')
+            self._extension = getattr(_import_module(module_name), name)
+        return self._extension
+
+    def __get__(self, protocol, cls):
+        if protocol is None:
+            return self
+        extension = self._extension
+        if extension is None:
+            extension = self.load()
+        return extension
+
+
+class ProtocolEnum(object):
+
+    """
+    :class:`utils.Enum` whose values are constants of a message of an
+    ``ostinato.protocols`` module, given as ``'<module>.<message>'``. The
+    module is only imported the first time the enum is used.
+
+        >>> _Mode = ProtocolEnum('mac_pb2.Mac', FIXED='e_mm_fixed')
+    """
+
+    def __init__(self, path, **keys):
+        self.path = path
+        self.keys = keys
+        self._enum = None
+
+    def __get__(self, protocol, cls):
+        if self._enum is None:
+            module_name, name = self.path.split('.')
+            message = getattr(_import_module(module_name), name)
+            values = dict((key, getattr(message, constant))
+                          for key, constant in self.keys.iteritems())
+            self._enum = type('_Mode', (utils.Enum, ), values)
+        return self._enum
+
+
+class Field(object):
+
+    """
+    Description of a protocol field, built from an entry of the ``_fields``
+    table of a protocol class: ``(name, offset, default_value, full_mask,
+    mask, ext_name, ext_override, doc, value_index, index)``.
+
+    The state of a protocol instance is a flat list. A field uses one entry
+    for the value of the extension field it belongs to (``value_index``, that
+    may be shared with other fields, for instance ``version`` and
+    ``header_length`` of IPv4) and four entries for its mode, step, count and
+    override flag, starting at ``index``. The layout is computed by the
+    generator, that also uses these objects to generate the ``_save()`` and
+    ``_fetch()`` methods, with the indices written directly.
+    """
+
+    def __init__(self, name, offset, default_value, full_mask, mask, ext_name,
+                 ext_override, doc, value_index, index):
+        self.name = name
+        self.offset = offset
+        self.default_value = default_value
+        self.full_mask = full_mask
+        self.mask = mask
+        self.ext_name = ext_name
+        self.ext_override = ext_override
+        if ext_override:
+            self.is_override_name = 'is_override_{}'.format(ext_override)
+            doc = '{}. By default, this attribute is set automatically. Set ' \
+                ':attr:`{}_override` to ``True`` to override this field' \
+                .format(doc, name)
+        self.doc = doc
+        shift = 0
+        if mask != 0:
+            while (mask >> shift) % 2 == 0:
+                shift += 1
+        self.shift = shift
+        if full_mask > 0xffff:
+            self.type = ost_pb.VariableField.kCounter32
+        elif full_mask > 0xff:
+            self.type = ost_pb.VariableField.kCounter16
+        else:
+            self.type = ost_pb.VariableField.kCounter8
+        self.value_index = value_index
+        self.mode_index = index
+        self.step_index = index + 1
+        self.count_index = index + 2
+        self.override_index = index + 3
+
+    def attributes(self):
+        """
+        Return the class attributes for this field, as a list of
+        ``(name, value)``.
+        """
+        name = self.name
+        attributes = [
+            (name, _Value(self)),
+            ('{}_mode'.format(name), _Mode(self)),
+            ('{}_step'.format(name), _Step(self)),
+            ('{}_count'.format(name), _Slot(self.count_index, doc=(
+                'If :attr:`{}_mode` is ``INCREMENT``, ``DECREMENT``, '
+                'specifies the number of packets before resetting the field '
+                'to its initial value.'.format(name)))),
+            ('_{}'.format(self.ext_name), _Raw(self.value_index)),
+            ('_{}_mode'.format(name), _Raw(self.mode_index)),
+            ('_{}_step'.format(name), _Raw(self.step_index)),
+            ('_{}_count'.format(name), _Raw(self.count_index)),
+            ('_{}_offset'.format(name), self.offset),
+            ('_{}_type'.format(name), self.type),
+            ('_{}_full_mask'.format(name), self.full_mask),
+            ('_{}_mask'.format(name), self.mask),
+        ]
+        if self.ext_override:
+            attributes.extend([
+                ('{}_override'.format(name), _Slot(self.override_index)),
+                ('_{}_override'.format(name), _Raw(self.override_index)),
+            ])
+        return attributes
+
+
+class _Raw(object):
+
+    """
+    Give a direct access to an entry of the state of a protocol instance.
+    """
+
+    __slots__ = ('index',)
+
+    def __init__(self, index):
+        self.index = index
+
+    def __get__(self, protocol, cls):
+        if protocol is None:
+            return self
+        return protocol._state[self.index]
+
+    def __set__(self, protocol, value):
+        protocol._state[self.index] = value
+
+
+class _Slot(object):
+
+    """
+    Like :class:`_Raw`, but setting the value marks the protocol as modified.
+    """
+
+    def __init__(self, index, doc=None):
+        self.index = index
+        self.__doc__ = doc
+
+    def __get__(self, protocol, cls):
+        if protocol is None:
+            return self
+        return protocol._state[self.index]
+
+    def __set__(self, protocol, value):
+        protocol._state[self.index] = value
+        protocol._dirty = True
+
+
+class _Value(object):
+
+    def __init__(self, field):
+        self.field = field
+        self.__doc__ = field.doc
+
+    def __get__(self, protocol, cls):
+        if protocol is None:
+            return self
+        field = self.field
+        return (protocol._state[field.value_index] & field.mask) >> field.shift
+
+    def __set__(self, protocol, value):
+        field = self.field
+        state = protocol._state
+        current_value = state[field.value_index]
+        state[field.value_index] = \
+            (current_value & (~field.mask & field.full_mask)) + \
+            ((utils.parse(value) << field.shift) & field.mask)
+        protocol._dirty = True
+
+
+class _Mode(object):
+
+    def __init__(self, field):
+        self.index = field.mode_index
+        self.__doc__ = (
+            'By default, :attr:`{}_mode` is ``FIXED``. Possible values are: '
+            '``INCREMENT``, ``DECREMENT``, ``RANDOM``, ``FIXED``.'
+            .format(field.name))
+
+    def __get__(self, protocol, cls):
+        if protocol is None:
+            return self
+        return FieldMode.get_key(protocol._state[self.index])
+
+    def __set__(self, protocol, mode):
+        protocol._state[self.index] = FieldMode.get_value(mode)
+        protocol._dirty = True
+
+
+class _Step(object):
+
+    def __init__(self, field):
+        self.index = field.step_index
+        self.shift = field.shift
+        self.__doc__ = (
+            'If :attr:`{}_mode` is set to ``INCREMENT`` or ``DECREMENT``, '
+            'specifies the increment or decrement step.'.format(field.name))
+
+    def __get__(self, protocol, cls):
+        if protocol is None:
+            return self
+        return protocol._state[self.index] >> self.shift
+
+    def __set__(self, protocol, step):
+        protocol._state[self.index] = step << self.shift
+        protocol._dirty = True
+
+
+class ProtocolType(type):
+
+    """
+    Metaclass of the protocols. When a class defines a ``_fields`` table, it
+    builds the :class:`Field` objects, and the corresponding class attributes
+    (see :meth:`Field.attributes()`).
+    """
+
+    def __new__(mcs, name, bases, attributes):
+        if '_fields' in attributes:
+            fields = tuple(Field(*entry) for entry in attributes['_fields'])
+            attributes['_field_list'] = fields
+            attributes['_state_size'] = \
+                max(field.override_index for field in fields) + 1
+            for field in fields:
+                for attribute, value in field.attributes():
+                    attributes.setdefault(attribute, value)
+        return super(ProtocolType, mcs).__new__(mcs, name, bases, attributes)
+
+
 class Protocol(object):
 
     """
-    Base class for the actual protocols
+    Base class for the actual protocols. The subclasses write and read their
+    state with ``_save(o_protocol)`` and ``_fetch(o_protocol)``: these methods
+    are generated for the classes of :mod:`autogenerates`, and written by
+    hand for the others.
     """
 
+    __metaclass__ = ProtocolType
+    __slots__ = ('_dirty', '_state', '__weakref__')
+
+    _field_list = ()
+    _state_size = 0
+    # Functions that convert a list of values to a list of integers, for the
+    # fields whose setter is overridden. See _set_many()
+    _bulk_parsers = {}
+
     def __init__(self, **kwargs):
+        self._state = list(self._initial_state())
+        # Set to True by the attributes setters, and reset once the layer has
+        # been saved or fetched. A new layer is always considered modified.
+        self._dirty = True
         for attribute, value in kwargs.iteritems():
             setattr(self, attribute, value)
 
-    # def _get_properties(self):
-    #     properties = []
-    #     for name in dir(self.__class__):
-    #         cls_attribute = getattr(self.__class__, name)
-    #         if isinstance(cls_attribute, property):
-    #             properties.append(name)
-    #     return properties
-
-    def _save(self, o_protocol):
-        while o_protocol.variable_field:
-            o_protocol.variable_field.remove(o_protocol.variable_field[-1])
-        for method in dir(self):
-            if method.startswith('_save_'):
-                getattr(self, method)(o_protocol)
-
-    def _fetch(self, o_protocol):
-        for method in dir(self):
-            if method.startswith('_fetch_'):
-                getattr(self, method)(o_protocol)
+    @classmethod
+    def _initial_state(cls):
+        """
+        Return the state of a new instance, with the default values of all
+        the fields. It is computed once per class, through the attributes
+        setters, so that the overrides are taken into account.
+        """
+        state = cls.__dict__.get('_initial_state_cache')
+        if state is None:
+            protocol = cls.__new__(cls)
+            protocol._state = [0] * cls._state_size
+            for field in cls._field_list:
+                setattr(protocol, field.name, field.default_value)
+            for field in cls._field_list:
+                setattr(protocol, '{}_mode'.format(field.name), 'FIXED')
+                setattr(protocol, '{}_step'.format(field.name),
+                        1 << field.shift)
+                setattr(protocol, '{}_count'.format(field.name), 1)
+                if field.ext_override:
+                    setattr(protocol, '{}_override'.format(field.name), False)
+            state = tuple(protocol._state)
+            cls._initial_state_cache = state
+        return state
+
+    @classmethod
+    def _set_many(cls, layers, name, values):
+        """
+        Set the ``name`` attribute of each of the ``layers`` (that must be
+        instances of this class) to the corresponding item of ``values``. For
+        the fields of the ``_fields`` table, the values are parsed, shifted
+        and masked at once, and then written in the state of the layers.
+        """
+        field = None
+        for candidate in cls._field_list:
+            if candidate.name == name:
+                field = candidate
+                break
+        parser = cls._bulk_parsers.get(name)
+        if field is None or (parser is None and
+                             not isinstance(getattr(cls, name), _Value)):
+            for layer, value in zip(layers, values):
+                setattr(layer, name, value)
+            return
+        if getattr(values, 'dtype', None) is not None \
+                and values.dtype.kind in 'iu':
+            # NumPy integer array
+            if parser is not None and len(values):
+                cls._check_range(field, values.min(), values.max())
+            values = ((values.astype('int64') << field.shift) & field.mask)
+            values = values.tolist()
+        else:
+            if hasattr(values, 'tolist'):
+                values = values.tolist()
+            if not all(isinstance(value, (int, long)) for value in values):
+                if parser is not None:
+                    values = parser(values)
+                else:
+                    values = [utils.parse(value) for value in values]
+            elif parser is not None and values:
+                cls._check_range(field, min(values), max(values))
+            shift, mask = field.shift, field.mask
+            values = [(value << shift) & mask for value in values]
+        keep = ~field.mask & field.full_mask
+        index = field.value_index
+        for layer, value in zip(layers, values):
+            state = layer._state
+            state[index] = (state[index] & keep) + value
+            layer._dirty = True
+
+    @staticmethod
+    def _check_range(field, minimum, maximum):
+        """
+        Raise ValueError if an integer between ``minimum`` and ``maximum`` does
+        not fit in the field. The fields that have a bulk parser are checked
+        this way, like their attributes setters do.
+        """
+        for value in (minimum, maximum):
+            if not 0 <= value <= field.mask >> field.shift:
+                raise ValueError('{} is out of range for {}'.format(
+                    value, field.name))
+
+    def __str__(self):
+        return '{}({})'.format(
+            type(self).__name__.lstrip('_'),
+            ','.join('{}={}'.format(field.name, getattr(self, field.name))
+                     for field in self._field_list))
+
+    def to_dict(self):
+        """
+        Return the layer configuration as a dictionnary.
+        """
+        dict_ = {}
+        for field in self._field_list:
+            for suffix in ('', '_mode', '_count', '_step', '_override'):
+                if suffix == '_override' and not field.ext_override:
+                    continue
+                attribute = field.name + suffix
+                dict_[attribute] = getattr(self, attribute)
+        return dict_
+
+    def from_dict(self, dict_):
+        """
+        Set the layer configuration from a dictionary. Keys must be the same
+        as the attributes names, and values but by valid values for these
+        attributes.
+        """
+        for attribute, value in dict_.items():
+            setattr(self, attribute, value)
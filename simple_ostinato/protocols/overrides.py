@@ -1,29 +1,33 @@
-import netaddr
-from ostinato.protocols import payload_pb2, mac_pb2
 from . import autogenerates
 from . import baseclass
+from .. import converters
 from .. import utils
 
 
 class Mac(autogenerates._Mac):
 
     __metaclass__ = baseclass.make_protocol_class
+    __slots__ = ()
 
-    class _Mode(utils.Enum):
-        FIXED = mac_pb2.Mac.e_mm_fixed
-        INCREMENT = mac_pb2.Mac.e_mm_inc
-        DECREMENT = mac_pb2.Mac.e_mm_dec
+    _Mode = baseclass.ProtocolEnum('mac_pb2.Mac',
+                                   FIXED='e_mm_fixed',
+                                   INCREMENT='e_mm_inc',
+                                   DECREMENT='e_mm_dec')
+
+    _bulk_parsers = {'source': converters.macs_to_ints,
+                     'destination': converters.macs_to_ints}
 
     @property
     def source(self):
         """
         Source MAC address
         """
-        return str(netaddr.EUI(self._src_mac))
+        return converters.int_to_mac(self._src_mac)
 
     @source.setter
     def source(self, value):
-        self._src_mac = netaddr.EUI(value).value
+        self._src_mac = converters.mac_to_int(value)
+        self._dirty = True
 
     @property
     def source_mode(self):
@@ -32,31 +36,19 @@ class Mac(autogenerates._Mac):
     @source_mode.setter
     def source_mode(self, value):
         self._source_mode = self._Mode.get_value(value)
-
-    def _save_source(self, o_protocol):
-        ext = o_protocol.Extensions[self._extension]
-        ext.src_mac = self._src_mac
-        ext.src_mac_step = self._source_step
-        ext.src_mac_mode = self._source_mode
-        ext.src_mac_count = self._source_count
-
-    def _fetch_source(self, o_protocol):
-        ext = o_protocol.Extensions[self._extension]
-        self._src_mac = ext.src_mac
-        self._source_step = ext.src_mac_step
-        self._source_mode = ext.src_mac_mode
-        self._source_count = ext.src_mac_count
+        self._dirty = True
 
     @property
     def destination(self):
         """
         destination MAC address
         """
-        return str(netaddr.EUI(self._dst_mac))
+        return converters.int_to_mac(self._dst_mac)
 
     @destination.setter
     def destination(self, value):
-        self._dst_mac = netaddr.EUI(value).value
+        self._dst_mac = converters.mac_to_int(value)
+        self._dirty = True
 
     @property
     def destination_mode(self):
@@ -65,60 +57,77 @@ class Mac(autogenerates._Mac):
     @destination_mode.setter
     def destination_mode(self, value):
         self._destination_mode = self._Mode.get_value(value)
+        self._dirty = True
 
-    def _save_destination(self, o_protocol):
+    def _save(self, o_protocol):
+        del o_protocol.variable_field[:]
         ext = o_protocol.Extensions[self._extension]
         ext.dst_mac = self._dst_mac
         ext.dst_mac_step = self._destination_step
         ext.dst_mac_mode = self._destination_mode
         ext.dst_mac_count = self._destination_count
+        ext.src_mac = self._src_mac
+        ext.src_mac_step = self._source_step
+        ext.src_mac_mode = self._source_mode
+        ext.src_mac_count = self._source_count
 
-    def _fetch_destination(self, o_protocol):
+    def _fetch(self, o_protocol):
         ext = o_protocol.Extensions[self._extension]
         self._dst_mac = ext.dst_mac
         self._destination_step = ext.dst_mac_step
         self._destination_mode = ext.dst_mac_mode
         self._destination_count = ext.dst_mac_count
+        self._src_mac = ext.src_mac
+        self._source_step = ext.src_mac_step
+        self._source_mode = ext.src_mac_mode
+        self._source_count = ext.src_mac_count
 
 
 class IPv4(autogenerates._IPv4):
 
     __metaclass__ = baseclass.make_protocol_class
+    __slots__ = ()
+
+    _bulk_parsers = {'source': converters.ip4s_to_ints,
+                     'destination': converters.ip4s_to_ints}
 
     @property
     def source(self):
-        return str(netaddr.IPAddress(self._src_ip))
+        return converters.int_to_ip4(self._src_ip)
 
     @source.setter
     def source(self, value):
-        self._src_ip = netaddr.IPAddress(value).value
+        self._src_ip = converters.ip4_to_int(value)
+        self._dirty = True
 
     @property
     def destination(self):
-        return str(netaddr.IPAddress(self._dst_ip))
+        return converters.int_to_ip4(self._dst_ip)
 
     @destination.setter
     def destination(self, value):
-        self._dst_ip = netaddr.IPAddress(value).value
+        self._dst_ip = converters.ip4_to_int(value)
+        self._dirty = True
 
 
 class Payload(baseclass.Protocol):
 
     __metaclass__ = baseclass.make_protocol_class
+    __slots__ = ('_mode', '_pattern')
 
     _protocol_id = 101
-    _extension = payload_pb2.payload
+    _extension = baseclass.Extension('payload_pb2.payload')
 
     def __init__(self, pattern='00 00 00 00', mode='FIXED_WORD', **kwargs):
         super(Payload, self).__init__(pattern=pattern, mode=mode, **kwargs)
         self.mode = mode
         self.pattern = pattern
 
-    class _Mode(utils.Enum):
-        DECREMENT_BYTE = payload_pb2.Payload.e_dp_dec_byte
-        FIXED_WORD = payload_pb2.Payload.e_dp_fixed_word
-        INCREMENT_BYTE = payload_pb2.Payload.e_dp_inc_byte
-        RANDOM = payload_pb2.Payload.e_dp_random
+    _Mode = baseclass.ProtocolEnum('payload_pb2.Payload',
+                                   DECREMENT_BYTE='e_dp_dec_byte',
+                                   FIXED_WORD='e_dp_fixed_word',
+                                   INCREMENT_BYTE='e_dp_inc_byte',
+                                   RANDOM='e_dp_random')
 
     @property
     def mode(self):
@@ -134,6 +143,7 @@ class Payload(baseclass.Protocol):
     @mode.setter
     def mode(self, value):
         self._mode = self._Mode.get_value(value)
+        self._dirty = True
 
     @property
     def pattern(self):
@@ -146,6 +156,7 @@ class Payload(baseclass.Protocol):
     @pattern.setter
     def pattern(self, value):
         self._pattern = utils.parse(value)
+        self._dirty = True
 
     def from_dict(self, values):
         for key, value in values.iteritems():
@@ -155,33 +166,31 @@ class Payload(baseclass.Protocol):
         return {'pattern': self.pattern,
                 'mode': self.mode}
 
-    def _save_pattern(self, o_protocol):
-        ext = o_protocol.Extensions[self._extension]
-        ext.pattern = self._pattern
-
-    def _fetch_pattern(self, o_protocol):
-        ext = o_protocol.Extensions[self._extension]
-        self._pattern = ext.pattern
-
-    def _save_mode(self, o_protocol):
+    def _save(self, o_protocol):
+        del o_protocol.variable_field[:]
         ext = o_protocol.Extensions[self._extension]
         ext.pattern_mode = self._mode
+        ext.pattern = self._pattern
 
-    def _fetch_mode(self, o_protocol):
+    def _fetch(self, o_protocol):
         ext = o_protocol.Extensions[self._extension]
         self._mode = ext.pattern_mode
+        self._pattern = ext.pattern
 
 
 class Ethernet(autogenerates._Ethernet):
 
     __metaclass__ = baseclass.make_protocol_class
+    __slots__ = ()
 
 
 class Udp(autogenerates._Udp):
 
     __metaclass__ = baseclass.make_protocol_class
+    __slots__ = ()
 
 
 class Tcp(autogenerates._Tcp):
 
     __metaclass__ = baseclass.make_protocol_class
+    __slots__ = ()
@@ -0,0 +1,475 @@
+"""
+This module implements the layer between the :class:`Drone`, :class:`Port` and
+:class:`Stream` objects and the underlying ``ostinato.core.DroneProxy``. It is
+for internal use only.
+"""
+import collections
+import contextlib
+import functools
+import socket
+import threading
+from ostinato.core import ost_pb
+try:
+    from ostinato.rpc import PeerClosedConnError
+except ImportError:
+    # older versions of python-ostinato let the socket errors through
+    PeerClosedConnError = socket.error
+
+
+class BatchError(Exception):
+
+    """
+    Raised when some calls failed while flushing a batch (see
+    :meth:`Drone.batch()`).
+
+    Attributes:
+
+        errors (list): list of ``(source, rpc_name, exception)`` tuples.
+            ``source`` is the :class:`Port` or :class:`Stream` object that
+            caused the error (or a description of it, if the object does not
+            exist anymore), ``rpc_name`` is the name of the failed call.
+    """
+
+    def __init__(self, errors):
+        self.errors = errors
+        message = '; '.join('{}: {} failed: {}'.format(source, name, exc)
+                            for (source, name, exc) in errors)
+        super(BatchError, self).__init__(message)
+
+
+class Batch(object):
+
+    """
+    Queue of deferred write calls. The calls are merged per RPC type (and per
+    port for the stream related calls), and sent when :meth:`flush()` is
+    called, in this order: ``deleteStream``, ``addStream``, ``modifyStream``,
+    ``modifyPort``, ``clearStats``.
+
+    Args:
+
+        drone (:class:`Drone`): the drone the calls are sent to.
+    """
+
+    #: Calls that are deferred until the batch is flushed
+    DEFERRED = ('deleteStream', 'addStream', 'modifyStream', 'modifyPort',
+                'clearStats')
+
+    def __init__(self, drone):
+        self._parent = drone
+        self._reset()
+
+    def _reset(self):
+        self._deleted = collections.OrderedDict()
+        self._added = collections.OrderedDict()
+        self._modified = collections.OrderedDict()
+        self._ports = collections.OrderedDict()
+        self._cleared = collections.OrderedDict()
+
+    def __len__(self):
+        return (sum(len(ids) for ids in self._deleted.itervalues()) +
+                sum(len(ids) for ids in self._added.itervalues()) +
+                sum(len(ids) for ids in self._modified.itervalues()) +
+                len(self._ports) + len(self._cleared))
+
+    def add(self, name, message):
+        """
+        Queue a call.
+
+        Args:
+
+            name (str): name of the call, one of :attr:`DEFERRED`
+            message: the protocol buffer message that is the argument of the
+                call.
+        """
+        getattr(self, '_add_{}'.format(name))(message)
+
+    def _add_deleteStream(self, o_stream_ids):
+        port_id = o_stream_ids.port_id.id
+        added = self._added.get(port_id, {})
+        modified = self._modified.get(port_id, {})
+        for o_stream_id in o_stream_ids.stream_id:
+            stream_id = o_stream_id.id
+            modified.pop(stream_id, None)
+            if stream_id in added:
+                # the stream has not been created yet, so there is nothing to
+                # delete.
+                del added[stream_id]
+            else:
+                self._deleted.setdefault(
+                    port_id, collections.OrderedDict())[stream_id] = True
+
+    def _add_addStream(self, o_stream_ids):
+        port_id = o_stream_ids.port_id.id
+        added = self._added.setdefault(port_id, collections.OrderedDict())
+        for o_stream_id in o_stream_ids.stream_id:
+            added[o_stream_id.id] = True
+
+    def _add_modifyStream(self, o_streams):
+        port_id = o_streams.port_id.id
+        modified = self._modified.setdefault(
+            port_id, collections.OrderedDict())
+        for o_stream in o_streams.stream:
+            modified[o_stream.stream_id.id] = o_stream
+
+    def _add_modifyPort(self, o_ports):
+        for o_port in o_ports.port:
+            self._ports[o_port.port_id.id] = o_port
+
+    def _add_clearStats(self, o_port_ids):
+        for o_port_id in o_port_ids.port_id:
+            self._cleared[o_port_id.id] = True
+
+    def _calls(self):
+        """
+        Return the merged calls, as a list of ``(name, build_message, items,
+        port_id)`` where ``items`` is a list of ``(source, item)``,
+        ``build_message(items)`` builds the argument of the call, and
+        ``port_id`` is the port of the stream related calls (``None`` for
+        the others).
+        """
+        calls = []
+        for port_id, stream_ids in self._deleted.iteritems():
+            calls.append(('deleteStream', _stream_id_list(port_id),
+                          self._stream_items(port_id, stream_ids), port_id))
+        for port_id, stream_ids in self._added.iteritems():
+            calls.append(('addStream', _stream_id_list(port_id),
+                          self._stream_items(port_id, stream_ids), port_id))
+        for port_id, o_streams in self._modified.iteritems():
+            items = [(self._source(port_id, stream_id), o_stream)
+                     for stream_id, o_stream in o_streams.iteritems()]
+            calls.append(('modifyStream', _stream_config_list(port_id),
+                          items, port_id))
+        if self._ports:
+            items = [(self._source(port_id), o_port)
+                     for port_id, o_port in self._ports.iteritems()]
+            calls.append(('modifyPort', _port_config_list, items, None))
+        if self._cleared:
+            items = [(self._source(port_id), port_id)
+                     for port_id in self._cleared]
+            calls.append(('clearStats', _port_id_list, items, None))
+        return [call for call in calls if call[2]]
+
+    def _stream_items(self, port_id, stream_ids):
+        return [(self._source(port_id, stream_id), stream_id)
+                for stream_id in stream_ids]
+
+    def _source(self, port_id, stream_id=None):
+        port = self._parent.get_port_by_id(port_id)
+        port_str = str(port) if port else 'port[{}]'.format(port_id)
+        if stream_id is None:
+            return port or port_str
+        stream = port.get_stream(stream_id) if port else None
+        return stream or 'stream[{}] of {}'.format(stream_id, port_str)
+
+    def flush(self, proxy):
+        """
+        Send all the queued calls, and empty the queue. If a merged call
+        fails, its items are sent one by one in order to find out which
+        objects caused the failure. Since a failed ``addStream`` or
+        ``deleteStream`` call may have been partly applied, the stream IDs of
+        the port are fetched first, and only the streams that were not added
+        (or not deleted) are sent again.
+
+        Args:
+
+            proxy (``ostinato.core.DroneProxy``): the object that performs the
+                actual calls.
+
+        Raises:
+
+            BatchError: if some calls failed. All the calls are attempted
+                anyway.
+        """
+        calls = self._calls()
+        self._reset()
+        errors = []
+        for name, build_message, items, port_id in calls:
+            rpc = getattr(proxy, name)
+            try:
+                rpc(build_message([item for (_, item) in items]))
+            except Exception:
+                if name in ('addStream', 'deleteStream'):
+                    items = self._unapplied(proxy, name, port_id, items)
+                for source, item in items:
+                    try:
+                        rpc(build_message([item]))
+                    except Exception as exc:
+                        errors.append((source, name, exc))
+                        self._mark_unsaved(name, port_id, item)
+        if errors:
+            raise BatchError(errors)
+
+    def discard(self):
+        """
+        Empty the queue without sending the calls. The ports and streams they
+        concern are considered modified again (see :meth:`_mark_unsaved()`).
+        """
+        calls = self._calls()
+        self._reset()
+        for name, _, items, port_id in calls:
+            for _, item in items:
+                self._mark_unsaved(name, port_id, item)
+
+    def _mark_unsaved(self, name, port_id, item):
+        """
+        Record that an item of a call has not been applied. The stream or
+        port it concerns is considered modified again, so that its next
+        ``save()`` sends it. If streams may not have been added or deleted,
+        the stream IDs of the port are fetched again before the next
+        allocation.
+        """
+        if name == 'modifyPort':
+            port_id = item.port_id.id
+        if port_id is None:
+            return
+        port = self._parent.get_port_by_id(port_id)
+        if port is None:
+            return
+        if name in ('addStream', 'deleteStream'):
+            port._stream_id_allocator = None
+            port._streams_last_check = None
+        elif name == 'modifyStream':
+            stream = port.get_stream(item.stream_id.id)
+            if stream is not None:
+                stream._dirty = True
+                stream.last_check = None
+        elif name == 'modifyPort':
+            port._dirty = True
+            port.last_check = None
+
+    @staticmethod
+    def _unapplied(proxy, name, port_id, items):
+        """
+        Return the items of a failed ``addStream`` or ``deleteStream`` call
+        that were not applied, according to the stream IDs that currently
+        exist on the port. If they cannot be fetched, all the items are
+        returned.
+        """
+        o_port_id = ost_pb.PortId()
+        o_port_id.id = port_id
+        try:
+            o_stream_ids = proxy.getStreamIdList(o_port_id)
+        except Exception:
+            return items
+        existing = set(o_stream_id.id
+                       for o_stream_id in o_stream_ids.stream_id)
+        added = name == 'addStream'
+        return [(source, stream_id) for (source, stream_id) in items
+                if (stream_id in existing) != added]
+
+
+def _stream_id_list(port_id):
+    def build(stream_ids):
+        o_stream_ids = ost_pb.StreamIdList()
+        o_stream_ids.port_id.id = port_id
+        for stream_id in stream_ids:
+            o_stream_ids.stream_id.add().id = stream_id
+        return o_stream_ids
+    return build
+
+
+def _stream_config_list(port_id):
+    def build(o_stream_list):
+        o_streams = ost_pb.StreamConfigList()
+        o_streams.port_id.id = port_id
+        for o_stream in o_stream_list:
+            o_streams.stream.add().CopyFrom(o_stream)
+        return o_streams
+    return build
+
+
+def _port_config_list(o_port_list):
+    o_ports = ost_pb.PortConfigList()
+    for o_port in o_port_list:
+        o_ports.port.add().CopyFrom(o_port)
+    return o_ports
+
+
+def _port_id_list(port_ids):
+    o_port_ids = ost_pb.PortIdList()
+    for port_id in port_ids:
+        o_port_ids.port_id.add().id = port_id
+    return o_port_ids
+
+
+class Channel(object):
+
+    """
+    A connection to a drone instance, that can be shared by several threads:
+    the calls are sent one at a time. If the connection is lost, it is
+    re-established, and calls that only read data (``get*`` calls) are sent
+    again. Other calls still raise an exception, since they may have been
+    performed before the connection was lost, but the next calls succeed.
+
+    Args:
+
+        proxy (``ostinato.core.DroneProxy``): the underlying connection.
+
+    Attributes:
+
+        pending (int): number of calls that are being sent or waiting for the
+            channel.
+    """
+
+    #: Exceptions that mean that the connection has been lost
+    CONNECTION_ERRORS = (socket.error, PeerClosedConnError)
+
+    def __init__(self, proxy):
+        self.proxy = proxy
+        self.lock = threading.RLock()
+        self.pending = 0
+        self._pending_lock = threading.Lock()
+
+    def connect(self):
+        with self.lock:
+            self.proxy.connect()
+
+    def disconnect(self):
+        with self.lock:
+            self.proxy.disconnect()
+
+    def _reconnect(self):
+        try:
+            self.proxy.disconnect()
+        except Exception:
+            pass
+        self.proxy.connect()
+
+    def call(self, name, *args, **kwargs):
+        """
+        Perform the ``name`` call with the given arguments, and return its
+        result.
+        """
+        with self._pending_lock:
+            self.pending += 1
+        try:
+            with self.lock:
+                rpc = getattr(self.proxy, name)
+                try:
+                    return rpc(*args, **kwargs)
+                except self.CONNECTION_ERRORS:
+                    self._reconnect()
+                    if not name.startswith('get'):
+                        raise
+                    return rpc(*args, **kwargs)
+        finally:
+            with self._pending_lock:
+                self.pending -= 1
+
+
+class _Router(object):
+
+    """
+    Object with the same calls as a ``DroneProxy``, that sends them with
+    :meth:`Dispatcher._send()`.
+    """
+
+    def __init__(self, dispatcher):
+        self._dispatcher = dispatcher
+
+    def __getattr__(self, name):
+        return functools.partial(self._dispatcher._send, name)
+
+
+class Dispatcher(object):
+
+    """
+    Forward the protocol buffer calls to the :class:`Channel` objects of a
+    :class:`Drone`. While a batch is open (see :meth:`start_batch()`), the
+    write calls are queued instead, and any other call first flushes the
+    queue, so that the calls are still performed in the right order.
+
+    If the drone has several channels, the calls that transfer large amounts
+    of data (:attr:`BULK`) are sent over the least busy of the other
+    channels, so that they do not delay the control and statistics calls,
+    which always use the first channel.
+
+    The calls can be issued from several threads: each channel sends them one
+    at a time. A thread can send all its calls over a given channel instead
+    (see :meth:`use_channel()`). A batch only queues the calls of the thread
+    that opened it.
+
+    Args:
+
+        drone (:class:`Drone`): the drone whose channels perform the calls.
+    """
+
+    #: Calls sent over the bulk channels
+    BULK = ('getStreamConfig', 'modifyStream', 'getCaptureBuffer')
+
+    def __init__(self, drone):
+        self._parent = drone
+        self._local = threading.local()
+
+    @property
+    def _batch(self):
+        return getattr(self._local, 'batch', None)
+
+    @property
+    def in_batch(self):
+        return self._batch is not None
+
+    def start_batch(self):
+        self._local.batch = Batch(self._parent)
+
+    def end_batch(self, flush=True):
+        """
+        Close the current batch, and send the queued calls if ``flush`` is
+        ``True``. Otherwise, they are discarded (see :meth:`Batch.discard()`).
+        """
+        batch, self._local.batch = self._batch, None
+        if flush:
+            batch.flush(_Router(self))
+        else:
+            batch.discard()
+
+    def flush(self):
+        """
+        Send the calls queued by the current batch, if any, and keep the
+        batch open.
+        """
+        batch = self._batch
+        if batch is not None:
+            batch.flush(_Router(self))
+
+    def _channel(self, name):
+        """
+        Return the :class:`Channel` the ``name`` call must be sent over.
+        """
+        channel = getattr(self._local, 'channel', None)
+        if channel is not None:
+            return channel
+        channels = self._parent._channels
+        if name not in self.BULK or len(channels) == 1:
+            return channels[0]
+        return min(channels[1:], key=lambda channel: channel.pending)
+
+    def _send(self, name, *args, **kwargs):
+        return self._channel(name).call(name, *args, **kwargs)
+
+    @contextlib.contextmanager
+    def use_channel(self, channel):
+        """
+        Context manager that sends all the calls of the current thread over
+        the given :class:`Channel`. If ``channel`` is ``None``, the calls are
+        dispatched as usual.
+        """
+        previous = getattr(self._local, 'channel', None)
+        self._local.channel = channel
+        try:
+            yield
+        finally:
+            self._local.channel = previous
+
+    def __getattr__(self, name):
+        # raise AttributeError right away for calls that do not exist
+        getattr(self._channel(name).proxy, name)
+        batch = self._batch
+        if batch is not None and name in Batch.DEFERRED:
+            return lambda message: batch.add(name, message)
+
+        def call(*args, **kwargs):
+            if batch is not None:
+                batch.flush(_Router(self))
+            return self._send(name, *args, **kwargs)
+        return call
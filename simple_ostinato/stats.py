@@ -0,0 +1,91 @@
+"""
+This module provides a class to store the statistics of several ports.
+"""
+
+#: Names of the counters available in the port statistics
+COUNTERS = (
+    'rx_bps',
+    'rx_bytes',
+    'rx_bytes_nic',
+    'rx_drops',
+    'rx_errors',
+    'rx_fifo_errors',
+    'rx_frame_errors',
+    'rx_pkts',
+    'rx_pkts_nic',
+    'rx_pps',
+    'tx_bps',
+    'tx_bytes',
+    'tx_bytes_nic',
+    'tx_pkts',
+    'tx_pkts_nic',
+    'tx_pps',
+)
+
+
+class Stats(object):
+
+    """
+    Statistics of several ports, stored by column: there is one list per
+    counter (see :data:`COUNTERS`), and each list has one item per port. For
+    instance, ``stats.tx_pkts[i]`` is the number of packets sent by the port
+    whose ID is ``stats.port_ids[i]``.
+
+    Args:
+
+        o_port_stats_list (``ost_pb.PortStatsList``): the statistics returned
+            by the drone instance.
+
+    Attributes:
+
+        port_ids (list): IDs of the ports, in the same order as the items of
+            the counters lists.
+    """
+
+    def __init__(self, o_port_stats_list):
+        self.port_ids = []
+        columns = [[] for _ in COUNTERS]
+        for o_stats in o_port_stats_list.port_stats:
+            self.port_ids.append(o_stats.port_id.id)
+            for counter, column in zip(COUNTERS, columns):
+                column.append(getattr(o_stats, counter))
+        for counter, column in zip(COUNTERS, columns):
+            setattr(self, counter, column)
+
+    def __len__(self):
+        return len(self.port_ids)
+
+    def __getitem__(self, counter):
+        """
+        Return the list of values of the given counter.
+        """
+        if counter not in COUNTERS:
+            raise KeyError(counter)
+        return getattr(self, counter)
+
+    def to_dict(self, port):
+        """
+        Return the statistics of a single port as a dictionary, like
+        :meth:`Port.get_stats()`.
+
+        Args:
+
+            port (:class:`Port` or int): the port, or its ID.
+        """
+        port_id = getattr(port, 'port_id', port)
+        position = self.port_ids.index(port_id)
+        return dict((counter, getattr(self, counter)[position])
+                    for counter in COUNTERS)
+
+    def to_dicts(self):
+        """
+        Return the statistics of all the ports as a dictionary, whose keys are
+        the port IDs, and values are dictionaries like the ones returned by
+        :meth:`Port.get_stats()`.
+        """
+        columns = zip(COUNTERS, [getattr(self, c) for c in COUNTERS])
+        stats = {}
+        for position, port_id in enumerate(self.port_ids):
+            stats[port_id] = dict((counter, column[position])
+                                  for counter, column in columns)
+        return stats
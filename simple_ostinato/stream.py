@@ -3,9 +3,9 @@ This module provide a class to manipulate streams.
 """
 from ostinato.protocols.protocol_pb2 import StreamControl, StreamCore
 from ostinato.core import ost_pb
+import threading
 import time
 from . import utils
-from . import protocols
 from . import constants
 
 
@@ -47,17 +47,48 @@ class Stream(object):
         port (:class:`Port`): the port instance on which the stream
             is defined.
         stream_id (int): the stream ID.
+
+    Attributes:
+
+        last_check (float): time at which the stream configuration was last
+            fetched from the remote drone instance, or ``None`` if it must be
+            fetched again.
     """
 
-    def __init__(self, port, stream_id, layers=None):
-        self.last_check = time.time()
+    def __init__(self, port, stream_id, layers=None, o_stream=None):
+        self._parent = port
         self.port_id = port.port_id
         self._drone = port._drone
         self.stream_id = stream_id
-        self.fetch()
+        if o_stream is None:
+            self.fetch()
+        else:
+            self._load(o_stream)
         if layers:
             self.layers.extend(layers)
 
+    @classmethod
+    def from_protobuf(cls, port, o_stream):
+        """
+        Create a :class:`Stream` from an ``ost_pb.Stream`` message that has
+        already been retrieved from the drone instance (for instance with a
+        ``getStreamConfig`` call for all the streams of a port). Unlike the
+        regular constructor, this does not perform any call to the drone
+        instance.
+
+        Args:
+
+            port (:class:`Port`): the port instance on which the stream
+                is defined.
+            o_stream (``ost_pb.Stream``): the stream configuration.
+        """
+        return cls(port, o_stream.stream_id.id, o_stream=o_stream)
+
+    @property
+    def _lock(self):
+        # the streams are protected by the lock of their port
+        return self._parent._lock
+
     @property
     def layers(self):
         """
@@ -69,6 +100,20 @@ class Stream(object):
     def layers(self, value):
         self._layers = value
 
+    def get_layer(self, name):
+        """
+        Return the first layer of the stream whose class is called ``name``
+        (for instance ``'IPv4'``).
+
+        Raises:
+
+            ValueError: if the stream has no such layer.
+        """
+        for layer in self.layers:
+            if type(layer).__name__ == name:
+                return layer
+        raise ValueError('{} has no {} layer'.format(self, name))
+
     def _fetch_layers(self, o_stream):
         o_protocols = o_stream.protocol
         self.layers = []
@@ -76,27 +121,20 @@ class Stream(object):
             protocol_id = o_protocol.protocol_id.id
             self.layers.append(_protocol_factory(protocol_id, o_protocol))
 
-    def _save_layers(self):
+    def _save_layers(self, o_stream):
         # remove the existing layers
-        o_streams = self._fetch()
-        o_stream = o_streams.stream[0]
-        o_protocols = o_stream.protocol
-        while len(o_protocols) > 0:
-            o_protocols.remove(o_protocols[-1])
+        del o_stream.protocol[:]
         # add the layers from self.layers
         for layer in self.layers:
             o_protocol = o_stream.protocol.add()
             o_protocol.protocol_id.id = layer._protocol_id
             layer._save(o_protocol)
-        # apply the changes
-        self._drone.modifyStream(o_streams)
 
-    def save(self):
+    def _dump(self, o_stream):
         """
-        Save the current stream configuration (including the protocols).
+        Write the stream configuration (including the layers) in the given
+        ``ost_pb.Stream`` message.
         """
-        o_streams = self._fetch()
-        o_stream = o_streams.stream[0]
         o_stream.core.is_enabled = self._is_enabled
         o_stream.core.name = self._name
         o_stream.core.len_mode = self._len_mode
@@ -111,15 +149,19 @@ class Stream(object):
         o_stream.control.next = self._next
         o_stream.control.bursts_per_sec = self._bursts_per_sec
         o_stream.control.packets_per_sec = self._packets_per_sec
-        self._drone.modifyStream(o_streams)
-        self._save_layers()
+        self._save_layers(o_stream)
 
-    def fetch(self):
+    def _load(self, o_stream):
         """
-        Fetch the stream configuration on the remote drone instance (including
-        all the layers).
+        Read the stream configuration (including the layers) from the given
+        ``ost_pb.Stream`` message. A copy of the message is kept, so that
+        the fields that are not handled by this class are preserved when the
+        stream is saved.
         """
-        o_stream = self._fetch().stream[0]
+        self.last_check = time.time()
+        self._o_stream = ost_pb.Stream()
+        self._o_stream.CopyFrom(o_stream)
+        old_name = self.name
         self._name = o_stream.core.name
         self._is_enabled = o_stream.core.is_enabled
         self._len_mode = o_stream.core.len_mode
@@ -135,12 +177,94 @@ class Stream(object):
         self._bursts_per_sec = o_stream.control.bursts_per_sec
         self._packets_per_sec = o_stream.control.packets_per_sec
         self._fetch_layers(o_stream)
+        self._mark_clean()
+        self._parent.streams.rename(self, old_name)
+
+    def _mark_clean(self):
+        self._dirty = False
+        self._saved_layers = list(self.layers)
+        for layer in self.layers:
+            layer._dirty = False
+
+    def _mark_saved(self, o_stream):
+        """
+        Record that the given ``ost_pb.Stream`` message has been successfully
+        sent to the drone instance.
+        """
+        self._o_stream.CopyFrom(o_stream)
+        self._mark_clean()
+        self.last_check = None
+
+    def _is_dirty(self):
+        """
+        Return ``True`` if the stream configuration or its layers have been
+        modified since they were last saved or fetched.
+        """
+        if self._dirty or len(self.layers) != len(self._saved_layers):
+            return True
+        for layer, saved_layer in zip(self.layers, self._saved_layers):
+            if layer is not saved_layer or layer._dirty:
+                return True
+        return False
+
+    def _save_to(self, o_streams):
+        """
+        Append the stream configuration to the given ``StreamConfigList``,
+        and return the new ``ost_pb.Stream`` message.
+        """
+        o_stream = o_streams.stream.add()
+        o_stream.CopyFrom(self._o_stream)
+        self._dump(o_stream)
+        return o_stream
+
+    @utils.synchronized
+    def save(self, verify=False, force=False):
+        """
+        Save the current stream configuration (including the protocols). This
+        is performed with a single call to the drone instance, and only if the
+        stream has been modified since it was last saved or fetched.
+
+        Args:
+
+            verify (bool): if ``True``, fetch the configuration back from the
+                drone instance after saving it, in order to reflect the values
+                that the drone actually applied.
+            force (bool): if ``True``, save the stream even if it has not been
+                modified.
+        """
+        if force or self._is_dirty():
+            o_streams = ost_pb.StreamConfigList()
+            o_streams.port_id.id = self.port_id
+            o_stream = self._save_to(o_streams)
+            self._drone.modifyStream(o_streams)
+            self._mark_saved(o_stream)
+        if verify:
+            self.fetch()
+
+    @utils.synchronized
+    def fetch(self, max_age=None):
+        """
+        Fetch the stream configuration on the remote drone instance (including
+        all the layers).
+
+        Args:
+
+            max_age (float): if the configuration has been fetched less than
+                ``max_age`` seconds ago, and has not been saved since, do
+                nothing. Defaults to :attr:`Drone.cache_ttl`.
+        """
+        if max_age is None:
+            max_age = self._parent._parent.cache_ttl
+        if utils.is_fresh(self.last_check, max_age):
+            return
+        self._load(self._fetch().stream[0])
 
     def _fetch(self):
         o_stream_ids = ost_pb.StreamIdList()
         o_stream_ids.port_id.id = self.port_id
         o_stream_id = o_stream_ids.stream_id.add()
         o_stream_id.id = self.stream_id
+        _load_protocols()
         o_streams = self._drone.getStreamConfig(o_stream_ids)
         return o_streams
 
@@ -155,7 +279,10 @@ class Stream(object):
 
     @name.setter
     def name(self, value):
+        old_name = self.name
         self._name = value
+        self._dirty = True
+        self._parent.streams.rename(self, old_name)
 
     @property
     def len_mode(self):
@@ -168,6 +295,7 @@ class Stream(object):
     @len_mode.setter
     def len_mode(self, mode):
         self._len_mode = _FrameLengthMode.get_value(mode)
+        self._dirty = True
 
     @property
     def frame_len(self):
@@ -176,6 +304,7 @@ class Stream(object):
     @frame_len.setter
     def frame_len(self, value):
         self._frame_len = value
+        self._dirty = True
 
     @property
     def frame_len_min(self):
@@ -184,6 +313,7 @@ class Stream(object):
     @frame_len_min.setter
     def frame_len_min(self, value):
         self._frame_len_min = value
+        self._dirty = True
 
     @property
     def frame_len_max(self):
@@ -192,6 +322,7 @@ class Stream(object):
     @frame_len_max.setter
     def frame_len_max(self, value):
         self._frame_len_max = value
+        self._dirty = True
 
     def enable(self):
         """
@@ -199,6 +330,7 @@ class Stream(object):
         ``True``.
         """
         self._is_enabled = True
+        self._dirty = True
 
     def disable(self):
         """
@@ -206,6 +338,7 @@ class Stream(object):
         ``False``.
         """
         self._is_enabled = False
+        self._dirty = True
 
     @property
     def is_enabled(self):
@@ -220,6 +353,7 @@ class Stream(object):
         if not isinstance(value, bool):
             raise TypeError('expected boolean value')
         self._is_enabled = value
+        self._dirty = True
 
     @property
     def unit(self):
@@ -232,6 +366,7 @@ class Stream(object):
     @unit.setter
     def unit(self, unit):
         self._unit = _SendUnit.get_value(unit)
+        self._dirty = True
 
     @property
     def mode(self):
@@ -252,6 +387,7 @@ class Stream(object):
     @mode.setter
     def mode(self, mode):
         self._mode = _SendMode.get_value(mode)
+        self._dirty = True
 
     @property
     def num_packets(self):
@@ -264,6 +400,7 @@ class Stream(object):
     @num_packets.setter
     def num_packets(self, value):
         self._num_packets = int(value)
+        self._dirty = True
 
     @property
     def num_bursts(self):
@@ -276,6 +413,7 @@ class Stream(object):
     @num_bursts.setter
     def num_bursts(self, value):
         self._num_bursts = int(value)
+        self._dirty = True
 
     @property
     def packets_per_burst(self):
@@ -288,6 +426,7 @@ class Stream(object):
     @packets_per_burst.setter
     def packets_per_burst(self, value):
         self._packets_per_burst = value
+        self._dirty = True
 
     @property
     def next(self):
@@ -304,6 +443,7 @@ class Stream(object):
     @next.setter
     def next(self, value):
         self._next = _SendNext.get_value(value)
+        self._dirty = True
 
     @property
     def bursts_per_sec(self):
@@ -315,6 +455,7 @@ class Stream(object):
     @bursts_per_sec.setter
     def bursts_per_sec(self, value):
         self._bursts_per_sec = int(value)
+        self._dirty = True
 
     @property
     def packets_per_sec(self):
@@ -326,6 +467,7 @@ class Stream(object):
     @packets_per_sec.setter
     def packets_per_sec(self, value):
         self._packets_per_sec = int(value)
+        self._dirty = True
 
     def __str__(self):
         if not self.name:
@@ -350,6 +492,7 @@ class Stream(object):
             'layers': layers,
         }
 
+    @utils.synchronized
     def from_dict(self, dictionary):
         for key, value in dictionary.iteritems():
             if key == 'layers':
@@ -363,16 +506,43 @@ class Stream(object):
                 setattr(self, key, value)
 
 
+_PROTOCOLS = {}
+# the protocols can be loaded from several threads at once (see
+# Drone.fetch_all_streams())
+_PROTOCOLS_LOCK = threading.Lock()
+
+
+def _load_protocols():
+    """
+    Import the protocol classes, and the protocol buffer modules that define
+    their extensions. This is done on first use rather than when
+    ``simple_ostinato`` is imported, but it must be done before fetching any
+    stream: the extensions of a message are only decoded if their module was
+    imported when the message was parsed.
+    """
+    if _PROTOCOLS:
+        return _PROTOCOLS
+    with _PROTOCOLS_LOCK:
+        if not _PROTOCOLS:
+            from . import protocols
+            mapping = {
+                constants._Protocols.MAC: protocols.Mac,
+                constants._Protocols.ETHERNET_II: protocols.Ethernet,
+                constants._Protocols.IP4: protocols.IPv4,
+                constants._Protocols.TCP: protocols.Tcp,
+                constants._Protocols.UDP: protocols.Udp,
+                constants._Protocols.PAYLOAD: protocols.Payload,
+            }
+            for protocol_cls in mapping.itervalues():
+                protocol_cls._extension.load()
+            # only filled once everything is loaded, so that the other
+            # threads do not skip the lock too early
+            _PROTOCOLS.update(mapping)
+    return _PROTOCOLS
+
+
 def _protocol_factory(protocol_id, o_protocol=None):
-    proto_cls_mapping = {
-        constants._Protocols.MAC: protocols.Mac,
-        constants._Protocols.ETHERNET_II: protocols.Ethernet,
-        constants._Protocols.IP4: protocols.IPv4,
-        constants._Protocols.TCP: protocols.Tcp,
-        constants._Protocols.UDP: protocols.Udp,
-        constants._Protocols.PAYLOAD: protocols.Payload,
-    }
-    protocol_cls = proto_cls_mapping[protocol_id]
+    protocol_cls = _load_protocols()[protocol_id]
     protocol = protocol_cls()
     if o_protocol:
         protocol._fetch(o_protocol)
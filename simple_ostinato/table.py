@@ -0,0 +1,193 @@
+"""
+This module provides a columnar view of the streams of a port.
+"""
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+#: Stream attributes available as columns
+STREAM_COLUMNS = (
+    'stream_id',
+    'name',
+    'is_enabled',
+    'len_mode',
+    'frame_len',
+    'frame_len_min',
+    'frame_len_max',
+    'unit',
+    'mode',
+    'next',
+    'num_packets',
+    'num_bursts',
+    'packets_per_burst',
+    'bursts_per_sec',
+    'packets_per_sec',
+)
+
+
+def _to_array(values):
+    """
+    Convert a column to a NumPy array, in which the ``None`` values are
+    masked.
+    """
+    missing = [value is None for value in values]
+    if not any(missing):
+        return numpy.array(values)
+    present = [value for value in values if value is not None]
+    if not present:
+        return numpy.ma.masked_all(len(values), dtype=object)
+    # the masked cells are filled with a valid value, so that the array gets
+    # the right type
+    filled = [present[0] if is_missing else value
+              for value, is_missing in zip(values, missing)]
+    return numpy.ma.array(filled, mask=missing)
+
+
+class StreamTable(object):
+
+    """
+    Columnar view of some streams of a port (see :meth:`Port.table()`).
+
+    A column is either a stream attribute (see :data:`STREAM_COLUMNS`), or a
+    layer attribute given as ``'<layer class name>.<attribute>'``, for
+    instance ``'IPv4.destination'``. ``table[column]`` returns one value per
+    stream, as a NumPy array if NumPy is installed, and as a list otherwise.
+
+    Streams that do not have the layer get ``None`` in the lists. In NumPy
+    arrays, their cells are masked instead (see ``numpy.ma``), so they are
+    excluded from the comparisons: ``table[table['IPv4.ttl'] < 10]`` only
+    selects streams that have an IPv4 layer. Note that with lists, on Python
+    2, ``None < 10`` is ``True``, so the ``None`` cells must be excluded
+    explicitly.
+
+    Indexing the table with a sequence of booleans (one per stream) returns
+    a table with the selected streams only. Assigning a column sets the
+    attribute of all the streams of the table (see :meth:`Port.set_field()`):
+
+        >>> table = my_port.table()
+        >>> slow = table[table['packets_per_sec'] < 100]
+        >>> slow['packets_per_sec'] = 100
+        >>> slow['IPv4.ttl'] = range(len(slow))
+        >>> table.save()
+
+    The columns are read from the stream objects the first time they are
+    accessed, and cached. Modifications made through the table or the
+    selections it returns are taken into account, but modifications made
+    directly on the :class:`Stream` objects are not: create a new table
+    instead.
+
+    Args:
+
+        port (:class:`Port`): the port the streams belong to.
+        streams (list): the :class:`Stream` objects of the table.
+    """
+
+    def __init__(self, port, streams, _root=None, _indices=None):
+        self._port = port
+        self.streams = list(streams)
+        # selections share the columns cache of the table they come from
+        self._root = _root or self
+        self._indices = _indices
+        self._columns = {}
+
+    def __len__(self):
+        return len(self.streams)
+
+    def __repr__(self):
+        return '<StreamTable: {} streams of {}>'.format(len(self), self._port)
+
+    def columns(self):
+        """
+        Return the names of the available columns: the stream attributes,
+        and the attributes of the layers configured on the streams.
+        """
+        columns = list(STREAM_COLUMNS)
+        seen = set()
+        for stream in self.streams:
+            for layer in stream.layers:
+                layer_name = type(layer).__name__
+                if layer_name in seen:
+                    continue
+                seen.add(layer_name)
+                columns.extend('{}.{}'.format(layer_name, attribute)
+                               for attribute in sorted(layer.to_dict()))
+        return columns
+
+    def _read_column(self, column):
+        if '.' not in column:
+            return [getattr(stream, column) for stream in self.streams]
+        layer_name, attribute = column.split('.', 1)
+        values = []
+        for stream in self.streams:
+            for layer in stream.layers:
+                if type(layer).__name__ == layer_name:
+                    values.append(getattr(layer, attribute))
+                    break
+            else:
+                values.append(None)
+        return values
+
+    def _column(self, column):
+        root = self._root
+        if column not in root._columns:
+            values = root._read_column(column)
+            if numpy is not None:
+                values = _to_array(values)
+            root._columns[column] = values
+        values = root._columns[column]
+        if self._indices is None:
+            return values
+        if numpy is not None:
+            return values[self._indices]
+        return [values[i] for i in self._indices]
+
+    def _select(self, mask):
+        if numpy is not None and isinstance(mask, numpy.ma.MaskedArray):
+            # the result of a comparison with missing cells
+            mask = mask.filled(False)
+        if isinstance(mask, slice):
+            selected = range(len(self))[mask]
+        else:
+            mask = list(mask)
+            if len(mask) != len(self):
+                raise IndexError('Got a mask of {} items for {} streams'
+                                 .format(len(mask), len(self)))
+            selected = [i for i, keep in enumerate(mask) if keep]
+        if self._indices is None:
+            indices = selected
+        else:
+            indices = [self._indices[i] for i in selected]
+        return StreamTable(self._port,
+                           [self.streams[i] for i in selected],
+                           _root=self._root, _indices=indices)
+
+    def __getitem__(self, key):
+        """
+        Return a column if ``key`` is a column name, or a table with the
+        selected streams if ``key`` is a sequence of booleans or a slice.
+        """
+        if isinstance(key, basestring):
+            return self._column(key)
+        return self._select(key)
+
+    def __setitem__(self, column, values):
+        """
+        Set the given column for all the streams of the table. ``values`` is
+        either a sequence with one value per stream, or a single value.
+        """
+        if column == 'stream_id':
+            raise ValueError('stream_id cannot be modified')
+        self._port.set_field(self.streams, column, values)
+        # setting an attribute may change others, so all the columns are
+        # read again
+        self._root._columns.clear()
+
+    def save(self):
+        """
+        Save the streams of the table that have been modified, with a single
+        call to the drone instance.
+        """
+        streams = [stream for stream in self.streams if stream._is_dirty()]
+        if streams:
+            self._port._save_streams(streams)
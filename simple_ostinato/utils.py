@@ -1,4 +1,10 @@
 import re
+import collections
+import functools
+import heapq
+import Queue
+import threading
+import time
 
 
 def hexstr_to_int(string):
@@ -24,15 +30,17 @@ def hexstr_to_int(string):
     >>> hexstr_to_int('0xff01a2')
     4282039056
     """
-    return int(re.sub(r'(^0x)?[\s:-]', '', string), 16)
+    return int(_HEXSTR_SEPARATORS.sub('', string), 16)
+
+
+_HEXSTR_SEPARATORS = re.compile(r'(^0x)?[\s:-]')
 
 
 def to_str(integer, padding=None, sep=':'):
-    string = hex(integer).replace('0x', '').upper()
+    string = '{:X}'.format(integer)
     if padding:
-        while len(string) < padding:
-            string = '0{}'.format(string)
-    return sep.join(re.findall('..?', string))
+        string = string.zfill(padding)
+    return sep.join([string[i:i + 2] for i in xrange(0, len(string), 2)])
 
 
 def parse(value):
@@ -44,26 +52,351 @@ def parse(value):
         raise ValueError('Invalid value {}'.format(value))
 
 
+def is_fresh(last_check, max_age):
+    """
+    Return ``True`` if ``last_check`` (a timestamp as returned by
+    ``time.time()``, or ``None`` if the data has never been checked or has
+    been invalidated) is less than ``max_age`` seconds old.
+    """
+    if last_check is None or not max_age:
+        return False
+    return time.time() - last_check < max_age
+
+
+def synchronized(method):
+    """
+    Decorator for the methods that must hold the ``_lock`` of their object
+    (a ``threading.RLock``) while they run.
+    """
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self._lock:
+            return method(self, *args, **kwargs)
+    return wrapper
+
+
+def parallel_map(function, items, workers):
+    """
+    Call ``function(item)`` for each item, from at most ``workers`` threads,
+    and return the list of ``(result, exception)`` tuples, in the order of
+    ``items``. ``exception`` is ``None`` if the call succeeded.
+
+    The worker threads are started for this call only, and exit once all the
+    items are processed. Unlike ``multiprocessing.pool.ThreadPool``, there
+    are no handler threads and no pool to set up and tear down, so it is
+    cheap enough to be used for every operation.
+    """
+    items = list(items)
+    outcomes = [None] * len(items)
+    tasks = Queue.Queue()
+    for task in enumerate(items):
+        tasks.put(task)
+
+    def work():
+        while True:
+            try:
+                index, item = tasks.get_nowait()
+            except Queue.Empty:
+                return
+            try:
+                outcomes[index] = (function(item), None)
+            except Exception as exc:
+                outcomes[index] = (None, exc)
+
+    threads = [threading.Thread(target=work)
+               for _ in xrange(max(1, min(workers, len(items))))]
+    for thread in threads:
+        thread.daemon = True
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return outcomes
+
+
+# class attributes that are not enum members
+_ENUM_IGNORED_TYPES = (classmethod, staticmethod, type(lambda: None))
+
+
+class _EnumType(type):
+
+    """
+    Metaclass of :class:`Enum`. It builds the lookup tables of an enum once,
+    when the class is created, so that looking up a key or a value does not
+    require to walk through the class attributes.
+    """
+
+    def __init__(cls, name, bases, attrs):
+        super(_EnumType, cls).__init__(name, bases, attrs)
+        keys = []
+        values = {}
+        reverse = {}
+        for key, value in attrs.iteritems():
+            if key.startswith('_') or isinstance(value, _ENUM_IGNORED_TYPES):
+                continue
+            keys.append(key)
+            values[key] = value
+            reverse.setdefault(value, key)
+        cls._keys = tuple(keys)
+        cls._values = values
+        cls._reverse = reverse
+
+    def __setattr__(cls, name, value):
+        if name in getattr(cls, '_values', ()):
+            raise AttributeError('{} is read-only'.format(name))
+        super(_EnumType, cls).__setattr__(name, value)
+
+
 class Enum(object):
 
+    __metaclass__ = _EnumType
+
     @classmethod
     def get_key(cls, value):
-        for key, val in cls.__dict__.iteritems():
-            if val == value:
-                return key
+        return cls._reverse.get(value)
 
     @classmethod
     def get_value(cls, key):
-        keys = cls.keys()
-        if key in keys:
-            return getattr(cls, key)
-        enum = cls.__name__
-        valid = ','.join([k for k in keys])
-        err = '{} not a valid {}. Must be one of: {}.'.format(key, enum, valid)
-        raise ValueError(err)
+        try:
+            return cls._values[key]
+        except (KeyError, TypeError):
+            enum = cls.__name__
+            valid = ','.join(cls._keys)
+            err = '{} not a valid {}. Must be one of: {}.'.format(
+                key, enum, valid)
+            raise ValueError(err)
 
     @classmethod
     def keys(cls):
-        for key in cls.__dict__.iterkeys():
-            if not key.startswith('_'):
-                yield key
+        return iter(cls._keys)
+
+
+class Index(object):
+
+    """
+    Ordered collection of objects, indexed by ID and by name. It behaves like
+    a list (iteration, ``len()``, positional access, :meth:`append()`,
+    :meth:`remove()`...) so that it can be used as such, but looking up an
+    object by ID or by name does not require to walk through the whole
+    collection.
+
+    Objects are expected to have a ``name`` attribute. When the name of an
+    object changes, :meth:`rename()` must be called to keep the name index up
+    to date.
+
+    The collection can be used from several threads: modifications are
+    atomic, and iterating over it walks through a snapshot.
+
+    Positional access uses a list of the objects, that is extended by
+    :meth:`append()` and rebuilt on the next positional access after a
+    removal, so that accessing all the positions one by one costs O(n).
+
+    Args:
+
+        id_attr (str): name of the attribute that holds the objects ID.
+        objects (list): initial content of the collection.
+    """
+
+    def __init__(self, id_attr, objects=None):
+        self._id_attr = id_attr
+        self._lock = threading.RLock()
+        self._by_id = collections.OrderedDict()
+        self._by_name = {}
+        # the objects in order, for positional access. None if it must be
+        # rebuilt.
+        self._positions = None
+        if objects:
+            self.extend(objects)
+
+    def _id(self, obj):
+        return getattr(obj, self._id_attr)
+
+    def get(self, obj_id):
+        """
+        Return the object that has the given ID, or ``None``.
+        """
+        return self._by_id.get(obj_id)
+
+    @synchronized
+    def get_by_name(self, name):
+        """
+        Return the list of the objects that have the given name.
+        """
+        return list(self._by_name.get(name, {}).itervalues())
+
+    @synchronized
+    def ids(self):
+        """
+        Return the list of the IDs of the objects, in order.
+        """
+        return list(self._by_id.iterkeys())
+
+    @synchronized
+    def append(self, obj):
+        """
+        Add an object at the end of the collection. If an object with the same
+        ID is already present, it is replaced.
+        """
+        obj_id = self._id(obj)
+        if obj_id in self._by_id:
+            self.remove(self._by_id[obj_id])
+        self._by_id[obj_id] = obj
+        self._add_name(obj.name, obj_id, obj)
+        if self._positions is not None:
+            self._positions.append(obj)
+
+    @synchronized
+    def extend(self, objects):
+        for obj in objects:
+            self.append(obj)
+
+    @synchronized
+    def remove(self, obj):
+        """
+        Remove an object from the collection. Raise ``ValueError`` if the
+        object is not present.
+        """
+        obj_id = self._id(obj)
+        if self._by_id.get(obj_id) is not obj:
+            raise ValueError('{} not in index'.format(obj))
+        del self._by_id[obj_id]
+        self._discard_name(obj.name, obj_id)
+        self._positions = None
+
+    @synchronized
+    def clear(self):
+        self._by_id.clear()
+        self._by_name.clear()
+        self._positions = None
+
+    @synchronized
+    def rename(self, obj, old_name):
+        """
+        Update the name index after the name of ``obj`` changed from
+        ``old_name`` to its current name. Objects that are not in the
+        collection are ignored.
+        """
+        obj_id = self._id(obj)
+        if old_name == obj.name or self._by_id.get(obj_id) is not obj:
+            return
+        self._discard_name(old_name, obj_id)
+        self._add_name(obj.name, obj_id, obj)
+
+    def _add_name(self, name, obj_id, obj):
+        if name not in self._by_name:
+            self._by_name[name] = collections.OrderedDict()
+        self._by_name[name][obj_id] = obj
+
+    def _discard_name(self, name, obj_id):
+        objects = self._by_name.get(name)
+        if objects is None:
+            return
+        objects.pop(obj_id, None)
+        if not objects:
+            del self._by_name[name]
+
+    @synchronized
+    def __iter__(self):
+        return iter(self._by_id.values())
+
+    def __len__(self):
+        return len(self._by_id)
+
+    def __contains__(self, obj):
+        return self._by_id.get(self._id(obj)) is obj
+
+    @synchronized
+    def __getitem__(self, position):
+        positions = self._positions
+        if positions is None:
+            if position == 0 and self._by_id:
+                return next(self._by_id.itervalues())
+            if position == -1 and self._by_id:
+                return self._by_id[next(reversed(self._by_id))]
+            positions = self._positions = list(self._by_id.itervalues())
+        return positions[position]
+
+    def __eq__(self, other):
+        if not isinstance(other, (list, tuple, Index)):
+            return NotImplemented
+        return list(self) == list(other)
+
+    def __ne__(self, other):
+        equal = self.__eq__(other)
+        if equal is NotImplemented:
+            return equal
+        return not equal
+
+    def __repr__(self):
+        return repr(list(self))
+
+
+class IdAllocator(object):
+
+    """
+    Allocate integer IDs, starting from 0. The IDs that are released are
+    reused first, lowest first. Allocating a new ID costs O(1), and reusing a
+    released ID costs O(log n), so allocating ``n`` IDs has a linear total
+    cost (instead of quadratic when searching for the first unused ID every
+    time).
+
+    The free IDs are kept as a heap of ``[start, end)`` ranges, so a large ID
+    in use (for instance a stream created by another client) does not cost
+    one entry per free ID below it.
+
+    Args:
+
+        used_ids (list): IDs that are already in use.
+    """
+
+    def __init__(self, used_ids=None):
+        self.reset(used_ids or [])
+
+    def reset(self, used_ids):
+        """
+        Forget about the previous allocations, and consider that only the
+        given IDs are in use.
+        """
+        self._used = set(used_ids)
+        self._free = []
+        start = 0
+        for used_id in sorted(self._used):
+            if used_id > start:
+                self._free.append((start, used_id))
+            start = used_id + 1
+        # a sorted list is a valid heap
+        self._next = start
+
+    def allocate(self):
+        """
+        Return an unused ID, and mark it as used.
+        """
+        free = self._free
+        if free:
+            start, end = free[0]
+            if start + 1 < end:
+                heapq.heapreplace(free, (start + 1, end))
+            else:
+                heapq.heappop(free)
+            self._used.add(start)
+            return start
+        new_id = self._next
+        self._next += 1
+        self._used.add(new_id)
+        return new_id
+
+    def allocate_many(self, count):
+        """
+        Return a list of ``count`` unused IDs, and mark them as used.
+        """
+        return [self.allocate() for _ in xrange(count)]
+
+    def release(self, released_id):
+        """
+        Mark an ID as unused, so that it can be allocated again. Releasing an
+        ID that is not in use (because it was never allocated, or has already
+        been released) does nothing.
+        """
+        if released_id not in self._used:
+            return
+        self._used.remove(released_id)
+        heapq.heappush(self._free, (released_id, released_id + 1))
@@ -0,0 +1,94 @@
+from nose2.compat import unittest
+from simple_ostinato import protocols
+from . import test_ports
+
+try:
+    from simple_ostinato import aio
+    from simple_ostinato.aio.wrappers import asyncio
+except ImportError:
+    aio = None
+
+PORTS = ['ost1', 'ost2', 'ost3', 'ost4', 'ost5', 'ost6']
+
+
+class AsyncLayer(test_ports.BaseLayer):
+
+    @classmethod
+    def setUp(cls):
+        if aio is None:
+            return
+        cls.loop = asyncio.new_event_loop()
+        cls.drones = [aio.AsyncDrone('localhost', loop=cls.loop)
+                      for _ in range(4)]
+        cls.run(*[drone.connect() for drone in cls.drones])
+        cls.run(*[drone.fetch_ports() for drone in cls.drones])
+
+    @classmethod
+    def tearDown(cls):
+        if aio is None:
+            return
+        cls.run(*[drone.disconnect() for drone in cls.drones])
+        for drone in cls.drones:
+            drone.close()
+        cls.loop.close()
+
+    @classmethod
+    def run(cls, *futures):
+        return cls.loop.run_until_complete(
+            asyncio.gather(*futures))
+
+
+@unittest.skipIf(aio is None, 'asyncio or trollius is required')
+class TestAsync(unittest.TestCase):
+
+    layer = AsyncLayer
+
+    def test_wrappers(self):
+        drone = self.layer.drones[0]
+        port = drone.get_port('ost1')
+        self.assertIsInstance(port, aio.AsyncPort)
+        self.assertIs(port, drone.get_port('ost1'))
+        self.assertIs(port, drone.get_port_by_id(port.port_id))
+        self.assertEqual(port.name, 'ost1')
+        self.assertIsNone(drone.get_port('not_a_port'))
+
+    def test_concurrent_streams(self):
+        run = self.layer.run
+        drones = self.layer.drones
+        # each port is handled by one of the drone objects
+        ports = [drones[i % len(drones)].get_port(name)
+                 for i, name in enumerate(PORTS)]
+        results = run(*[port.add_streams([[protocols.Mac()]] * 50)
+                        for port in ports])
+        for streams in results:
+            self.assertEqual(len(streams), 50)
+            self.assertIsInstance(streams[0], aio.AsyncStream)
+
+        for port in ports:
+            for stream in port.streams:
+                stream.num_packets = 42
+        run(*[stream.save() for port in ports for stream in port.streams])
+
+        run(*[port.fetch_streams() for port in ports])
+        for port in ports:
+            self.assertEqual(len(port.streams), 50)
+            self.assertEqual(port.streams[0].num_packets, 42)
+            self.assertIsInstance(port.streams[0].layers[0], protocols.Mac)
+
+        run(*[port.del_streams([stream.stream_id for stream in port.streams])
+              for port in ports])
+        run(*[port.fetch_streams() for port in ports])
+        for port in ports:
+            self.assertEqual(len(port.streams), 0)
+
+    def test_send_and_stats(self):
+        run = self.layer.run
+        drone = self.layer.drones[1]
+        ports = [drone.get_port(name) for name in PORTS]
+        run(*[port.clear_stats() for port in ports])
+        run(*[port.start_send() for port in ports])
+        run(*[port.stop_send() for port in ports])
+        stats = run(*[port.get_stats() for port in ports])
+        self.assertEqual(len(stats), len(PORTS))
+        stats = run(drone.get_stats())[0]
+        self.assertEqual(len(stats), len(drone.ports))
@@ -0,0 +1,76 @@
+import random
+import netaddr
+from nose2.compat import unittest
+from simple_ostinato import converters
+
+
+class TestConverters(unittest.TestCase):
+
+    def setUp(self):
+        self.rand = random.Random(0)
+
+    def test_mac(self):
+        for _ in range(1000):
+            value = self.rand.randint(0, 0xffffffffffff)
+            mac = str(netaddr.EUI(value))
+            self.assertEqual(converters.int_to_mac(value), mac)
+            self.assertEqual(converters.mac_to_int(mac), value)
+            self.assertEqual(converters.mac_to_int(mac.replace('-', ':')),
+                             value)
+            self.assertEqual(converters.mac_to_int(mac.lower()), value)
+        self.assertEqual(converters.mac_to_int(12), 12)
+        self.assertEqual(converters.mac_to_int(u'FF:FF:FF:FF:FF:FF'),
+                         0xffffffffffff)
+        # the other formats accepted by netaddr
+        for mac in ('0:1:2:a:b:c', '0-1-2-a-b-c', '0011.22aa.bbcc',
+                    '11:22aa:bbcc', '0011-22aa-bbcc', '001122:aabbcc',
+                    '001122-aabbcc', '001122aabbcc'):
+            self.assertEqual(converters.mac_to_int(mac),
+                             netaddr.EUI(mac).value)
+        for invalid in ('00:11:22:33:44', '00:11:22:33:44:GG', '',
+                        '00:11-22:33:44:55', '000:11:22:33:44:55',
+                        '00.11.22.33.44.55', '0x11.22aa.bbcc', ' 0:1:2:3:4:5',
+                        '001122aabbc', 0x1000000000000, -1):
+            with self.assertRaises(ValueError):
+                converters.mac_to_int(invalid)
+        for invalid in (0x1000000000000, -1):
+            with self.assertRaises(ValueError):
+                converters.int_to_mac(invalid)
+
+    def test_ip4(self):
+        for _ in range(1000):
+            value = self.rand.randint(0, 0xffffffff)
+            address = str(netaddr.IPAddress(value))
+            self.assertEqual(converters.int_to_ip4(value), address)
+            self.assertEqual(converters.ip4_to_int(address), value)
+        self.assertEqual(converters.ip4_to_int(12), 12)
+        self.assertEqual(converters.ip4_to_int(u'10.0.0.1'), 0x0a000001)
+        # only dotted quads are accepted
+        for invalid in ('10.0.0.256', '10.1', '10.0.1', '0x0a.0.0.1',
+                        '1.2.3.4.5', ' 10.0.0.1', '', 0x100000000, -1):
+            with self.assertRaises(ValueError):
+                converters.ip4_to_int(invalid)
+        for invalid in (0x100000000, -1):
+            with self.assertRaises(ValueError):
+                converters.int_to_ip4(invalid)
+
+    def test_bulk(self):
+        ints = [self.rand.randint(0, 0xffffffff) for _ in range(1000)]
+        ips = converters.ints_to_ip4s(ints)
+        self.assertEqual(ips, [converters.int_to_ip4(i) for i in ints])
+        self.assertEqual(converters.ip4s_to_ints(ips), ints)
+        self.assertEqual(converters.ip4s_to_ints(iter(ips)), ints)
+        self.assertEqual(converters.ip4s_to_ints(['10.0.0.1', 3]),
+                         [0x0a000001, 3])
+        for invalid in (['10.0.0.1', 'foo'], ['10.0.0.1', '10.1']):
+            with self.assertRaises(ValueError):
+                converters.ip4s_to_ints(invalid)
+        with self.assertRaises(ValueError):
+            converters.ints_to_ip4s([1, 0x100000000])
+        self.assertEqual(converters.ints_to_ip4s([]), [])
+
+        macs = converters.ints_to_macs(ints)
+        self.assertEqual(macs, [converters.int_to_mac(i) for i in ints])
+        self.assertEqual(converters.macs_to_ints(macs), ints)
+        with self.assertRaises(ValueError):
+            converters.ints_to_macs([1, 0x1000000000000])
@@ -0,0 +1,52 @@
+import subprocess
+import sys
+from nose2.compat import unittest
+
+
+def loaded_modules(code):
+    """
+    Run ``code`` in a new interpreter, and return the ``ostinato.protocols``
+    modules it imported.
+    """
+    script = '\n'.join([
+        code,
+        'import sys',
+        'for name in sorted(sys.modules):',
+        '    if sys.modules[name] is not None:',
+        '        print(name)'])
+    output = subprocess.check_output([sys.executable, '-c', script])
+    return [name for name in output.decode().split()
+            if name.startswith('ostinato.protocols.')]
+
+
+class TestLazyImports(unittest.TestCase):
+
+    def test_import_package(self):
+        # only the modules that ostinato.core itself imports
+        self.assertEqual(
+            loaded_modules('import ostinato.core'),
+            loaded_modules('import simple_ostinato'))
+
+    def test_import_protocols(self):
+        modules = loaded_modules('from simple_ostinato import protocols')
+        self.assertNotIn('ostinato.protocols.ip4_pb2', modules)
+        self.assertNotIn('ostinato.protocols.arp_pb2', modules)
+        self.assertNotIn('ostinato.protocols.mac_pb2', modules)
+        self.assertNotIn('ostinato.protocols.payload_pb2', modules)
+
+    def test_load_on_use(self):
+        modules = loaded_modules('\n'.join([
+            'from ostinato.core import ost_pb',
+            'from simple_ostinato import protocols',
+            'protocols.IPv4(source="10.0.0.1")._save(ost_pb.Protocol())']))
+        self.assertIn('ostinato.protocols.ip4_pb2', modules)
+        self.assertNotIn('ostinato.protocols.tcp_pb2', modules)
+        self.assertNotIn('ostinato.protocols.arp_pb2', modules)
+        self.assertNotIn('ostinato.protocols.mac_pb2', modules)
+
+    def test_load_mode_enums(self):
+        modules = loaded_modules('\n'.join([
+            'from simple_ostinato import protocols',
+            'protocols.Payload(mode="RANDOM")']))
+        self.assertIn('ostinato.protocols.payload_pb2', modules)
+        self.assertNotIn('ostinato.protocols.mac_pb2', modules)
@@ -0,0 +1,55 @@
+from nose2.compat import unittest
+from simple_ostinato import DronePool, Port
+from simple_ostinato.pool import PoolError
+from . import test_ports
+
+HOSTS = ['localhost', '127.0.0.1']
+
+
+class TestDronePool(unittest.TestCase):
+
+    layer = test_ports.BaseLayer
+
+    def test_ports(self):
+        pool = DronePool(HOSTS)
+        pool.fetch_ports()
+        self.assertEqual(len(pool.ports),
+                         sum(len(drone.ports)
+                             for drone in pool.drones.values()))
+        for host in HOSTS:
+            port = pool.get_port('{}:ost1'.format(host))
+            self.assertIsInstance(port, Port)
+            self.assertIs(port._parent, pool.drones[host])
+            self.assertIs(pool.ports['{}:ost1'.format(host)], port)
+        self.assertIsNone(pool.get_port('localhost:not_a_port'))
+        self.assertIsNone(pool.get_port('not_a_host:ost1'))
+        pool.disconnect()
+
+    def test_send_and_stats(self):
+        pool = DronePool(HOSTS, workers=1)
+        pool.fetch_ports()
+        ports = ['localhost:ost1', pool.get_port('127.0.0.1:ost2')]
+        pool.clear_stats(ports)
+        pool.start_send(ports)
+        pool.stop_send(ports)
+        stats = pool.get_stats(ports)
+        self.assertEqual(list(stats), HOSTS)
+        self.assertEqual([len(host_stats) for host_stats in stats.values()],
+                         [1, 1])
+        self.assertEqual(len(pool.get_stats()['localhost']),
+                         len(pool.drones['localhost'].ports))
+        with self.assertRaises(ValueError):
+            pool.start_send(['localhost:not_a_port'])
+        pool.disconnect()
+
+    def test_errors(self):
+        pool = DronePool(HOSTS + ['not.a.host.invalid'], connect=False)
+        with self.assertRaises(PoolError) as context:
+            pool.connect()
+        errors = context.exception.errors
+        self.assertEqual(list(errors), ['not.a.host.invalid'])
+        self.assertEqual(list(context.exception.results), HOSTS)
+        del pool.drones['not.a.host.invalid']
+        pool.fetch_ports()
+        self.assertIsInstance(pool.get_port('localhost:ost1'), Port)
+        pool.disconnect()
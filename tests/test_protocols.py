@@ -1,8 +1,15 @@
+import inspect
 import os
 import pyshark
+try:
+    import numpy
+except ImportError:
+    numpy = None
 import netaddr
 from nose2.compat import unittest
 from nose2.tools.params import params
+from ostinato.core import ost_pb
+from simple_ostinato import protocols
 from . import utils
 
 
@@ -59,6 +66,115 @@ class ToFromDict(unittest.TestCase):
             utils.sanitize_dict(fresh_port.to_dict()))
 
 
+class SaveFetch(unittest.TestCase):
+
+    def _layers(self):
+        ip = protocols.IPv4(source='10.0.0.1', ttl=64, flag_df=1)
+        ip.destination_mode = 'INCREMENT'
+        ip.destination_count = 10
+        ip.header_length_override = True
+        ip.header_length = 6
+        tcp = protocols.Tcp(flag_syn=1, sequence_num=12)
+        tcp.source_mode = 'RANDOM'
+        tcp.flag_ack_mode = 'INCREMENT'
+        return [ip, tcp, protocols.Ethernet(ether_type=0x86dd),
+                protocols.Udp(checksum=0xffff)]
+
+    @params(0, 1, 2, 3)
+    def test_save_fetch(self, index):
+        layer = self._layers()[index]
+        o_protocol = ost_pb.Protocol()
+        layer._save(o_protocol)
+        fetched = type(layer)()
+        fetched._fetch(o_protocol)
+        self.assertEqual(fetched.to_dict(), layer.to_dict())
+        o_fetched = ost_pb.Protocol()
+        fetched._save(o_fetched)
+        self.assertEqual(o_fetched, o_protocol)
+
+    def test_compact_state(self):
+        # the fields are stored in a single list, not in a __dict__
+        for layer in self._layers() + [protocols.Mac(), protocols.Payload()]:
+            self.assertFalse(hasattr(layer, '__dict__'))
+        ip = protocols.IPv4(version=6, header_length=7)
+        self.assertEqual(ip._ver_hdrlen, 0x67)
+        ip.version = 4
+        self.assertEqual(ip._ver_hdrlen, 0x47)
+        # the constructor arguments are not overwritten by the defaults
+        udp = protocols.Udp(checksum_override=True, source_mode='RANDOM')
+        self.assertTrue(udp.checksum_override)
+        self.assertEqual(udp.source_mode, 'RANDOM')
+
+    def test_subclass_attributes(self):
+        # the subclasses that do not define __slots__ can still have extra
+        # attributes
+        class MyIPv4(protocols.IPv4):
+            pass
+        ip = MyIPv4(ttl=64, comment='first')
+        ip.label = 'test'
+        self.assertEqual((ip.ttl, ip.comment, ip.label), (64, 'first', 'test'))
+
+    def test_constructor_arguments(self):
+        # the generated constructors have a named parameter per field
+        args = inspect.getargspec(protocols.IPv4.__init__)
+        self.assertEqual(args.args[1:], sorted(
+            field.name for field in protocols.IPv4._field_list))
+        self.assertEqual(args.defaults[args.args.index('ttl') - 1], 127)
+        ip = protocols.IPv4(0, '10.0.0.2', ttl=64)
+        self.assertEqual(ip.destination, '10.0.0.2')
+        self.assertEqual(ip.ttl, 64)
+        self.assertEqual(ip.source, '127.0.0.1')
+
+
+class SetMany(unittest.TestCase):
+
+    def test_set_many(self):
+        layers = [protocols.IPv4(version=4, header_length=5)
+                  for _ in range(4)]
+        protocols.IPv4._set_many(layers, 'header_length', [6, 7, 8, 0x1f])
+        self.assertEqual([layer.header_length for layer in layers],
+                         [6, 7, 8, 0xf])
+        self.assertEqual([layer.version for layer in layers], [4] * 4)
+        self.assertTrue(all(layer._dirty for layer in layers))
+
+        ips = ['10.0.0.1', '10.0.0.2', '10.0.0.3', 0x0a000004]
+        protocols.IPv4._set_many(layers, 'destination', ips)
+        self.assertEqual([layer.destination for layer in layers],
+                         ['10.0.0.1', '10.0.0.2', '10.0.0.3', '10.0.0.4'])
+
+        # fields that are not in the table go through the setters
+        protocols.IPv4._set_many(layers, 'ttl_mode', ['RANDOM'] * 4)
+        self.assertEqual([layer.ttl_mode for layer in layers],
+                         ['RANDOM'] * 4)
+
+        macs = [protocols.Mac() for _ in range(2)]
+        protocols.Mac._set_many(macs, 'source', ['00:00:00:00:00:01', 2])
+        self.assertEqual([mac.source for mac in macs],
+                         ['00-00-00-00-00-01', '00-00-00-00-00-02'])
+
+        # the addresses are checked like with the setters
+        for values in ([1, 2 ** 32, 3, 4], [-1] * 4):
+            with self.assertRaises(ValueError):
+                protocols.IPv4._set_many(layers, 'destination', values)
+        with self.assertRaises(ValueError):
+            protocols.Mac._set_many(macs, 'source', [1, 2 ** 48])
+        self.assertEqual(layers[1].destination, '10.0.0.2')
+
+    @unittest.skipIf(numpy is None, 'numpy is not installed')
+    def test_set_many_numpy(self):
+        layers = [protocols.Tcp() for _ in range(100)]
+        protocols.Tcp._set_many(layers, 'flag_syn', numpy.arange(100) % 2)
+        protocols.Tcp._set_many(layers, 'source', numpy.arange(100) + 1000)
+        self.assertEqual([layer.flag_syn for layer in layers],
+                         [i % 2 for i in range(100)])
+        self.assertEqual([layer.source for layer in layers],
+                         [i + 1000 for i in range(100)])
+        ips = [protocols.IPv4() for _ in range(2)]
+        with self.assertRaises(ValueError):
+            protocols.IPv4._set_many(ips, 'source',
+                                     numpy.array([1, 2 ** 32]))
+
+
 class TrafficMacEthLayer(BaseLayer):
 
     @classmethod
@@ -0,0 +1,142 @@
+from nose2.compat import unittest
+from ostinato.core import ost_pb
+from simple_ostinato import rpc
+
+
+class RecordingProxy(object):
+
+    """
+    Record the calls instead of sending them to drone. Calls whose argument
+    contains one of the ``failing_ids`` stream IDs raise an exception.
+    """
+
+    def __init__(self, failing_ids=()):
+        self.calls = []
+        self.failing_ids = failing_ids
+
+    def __getattr__(self, name):
+        def call(message):
+            self.calls.append((name, message))
+            for o_stream in getattr(message, 'stream', []):
+                if o_stream.stream_id.id in self.failing_ids:
+                    raise RuntimeError('invalid stream')
+        return call
+
+
+class StreamsProxy(object):
+
+    """
+    Keep the set of streams of a port. ``addStream`` and ``deleteStream``
+    apply the stream IDs one by one, and raise an exception at the first of
+    the ``failing_ids``, like a drone instance that partly applied a call.
+    """
+
+    def __init__(self, existing=(), failing_ids=()):
+        self.streams = set(existing)
+        self.failing_ids = failing_ids
+        self.calls = []
+
+    def _apply(self, name, o_stream_ids, apply):
+        ids = [o_stream_id.id for o_stream_id in o_stream_ids.stream_id]
+        self.calls.append((name, ids))
+        for stream_id in ids:
+            if stream_id in self.failing_ids:
+                raise RuntimeError('invalid stream')
+            apply(stream_id)
+
+    def addStream(self, o_stream_ids):
+        def add(stream_id):
+            if stream_id in self.streams:
+                raise RuntimeError('stream {} exists'.format(stream_id))
+            self.streams.add(stream_id)
+        self._apply('addStream', o_stream_ids, add)
+
+    def deleteStream(self, o_stream_ids):
+        self._apply('deleteStream', o_stream_ids, self.streams.remove)
+
+    def getStreamIdList(self, o_port_id):
+        self.calls.append(('getStreamIdList', []))
+        return stream_ids(o_port_id.id, *sorted(self.streams))
+
+
+class NoPorts(object):
+
+    def get_port_by_id(self, port_id):
+        return None
+
+
+def stream_ids(port_id, *ids):
+    o_stream_ids = ost_pb.StreamIdList()
+    o_stream_ids.port_id.id = port_id
+    for stream_id in ids:
+        o_stream_ids.stream_id.add().id = stream_id
+    return o_stream_ids
+
+
+def stream_configs(port_id, *ids):
+    o_streams = ost_pb.StreamConfigList()
+    o_streams.port_id.id = port_id
+    for stream_id in ids:
+        o_streams.stream.add().stream_id.id = stream_id
+    return o_streams
+
+
+class TestBatch(unittest.TestCase):
+
+    def test_merge(self):
+        batch = rpc.Batch(NoPorts())
+        batch.add('addStream', stream_ids(0, 1, 2))
+        batch.add('addStream', stream_ids(0, 3))
+        batch.add('modifyStream', stream_configs(0, 1, 2))
+        batch.add('modifyStream', stream_configs(0, 2, 3))
+        batch.add('deleteStream', stream_ids(0, 3))
+        batch.add('deleteStream', stream_ids(0, 4))
+        batch.add('addStream', stream_ids(1, 0))
+        proxy = RecordingProxy()
+        batch.flush(proxy)
+        self.assertEqual(len(batch), 0)
+        calls = [(name, message.port_id.id) for name, message in proxy.calls]
+        self.assertEqual(calls, [('deleteStream', 0),
+                                 ('addStream', 0),
+                                 ('addStream', 1),
+                                 ('modifyStream', 0)])
+        # stream 3 was added and deleted in the same batch
+        self.assertEqual([o.id for o in proxy.calls[0][1].stream_id], [4])
+        self.assertEqual([o.id for o in proxy.calls[1][1].stream_id], [1, 2])
+        self.assertEqual(
+            [o.stream_id.id for o in proxy.calls[3][1].stream], [1, 2])
+
+    def test_errors(self):
+        batch = rpc.Batch(NoPorts())
+        batch.add('modifyStream', stream_configs(0, 1, 2, 3))
+        proxy = RecordingProxy(failing_ids=[2])
+        with self.assertRaises(rpc.BatchError) as context:
+            batch.flush(proxy)
+        errors = context.exception.errors
+        self.assertEqual(len(errors), 1)
+        self.assertEqual(errors[0][0], 'stream[2] of port[0]')
+        self.assertEqual(errors[0][1], 'modifyStream')
+
+    def test_partial_failure(self):
+        batch = rpc.Batch(NoPorts())
+        batch.add('addStream', stream_ids(0, 1, 2, 3))
+        batch.add('deleteStream', stream_ids(0, 7, 8, 9))
+        proxy = StreamsProxy(existing=[7, 8, 9], failing_ids=[2, 8])
+        with self.assertRaises(rpc.BatchError) as context:
+            batch.flush(proxy)
+        # the streams that were added or deleted by the failed calls are not
+        # sent again
+        self.assertEqual(proxy.calls, [
+            ('deleteStream', [7, 8, 9]),
+            ('getStreamIdList', []),
+            ('deleteStream', [8]),
+            ('deleteStream', [9]),
+            ('addStream', [1, 2, 3]),
+            ('getStreamIdList', []),
+            ('addStream', [2]),
+            ('addStream', [3])])
+        self.assertEqual(proxy.streams, set([1, 3, 8]))
+        self.assertEqual(
+            [(source, name) for (source, name, _) in context.exception.errors],
+            [('stream[8] of port[0]', 'deleteStream'),
+             ('stream[2] of port[0]', 'addStream')])
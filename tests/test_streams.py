@@ -1,11 +1,23 @@
 import os
+import time
 from nose2.compat import unittest
 from simple_ostinato import protocols
+from simple_ostinato import table as table_module
 import pyshark
 from . import utils
 from . import test_ports
 
 
+def as_list(column):
+    """
+    Convert a column of a table to a list. With NumPy, the masked cells become
+    ``None``.
+    """
+    if hasattr(column, 'tolist'):
+        return column.tolist()
+    return list(column)
+
+
 class BaseLayer(test_ports.PortsFetchedLayer):
 
     @classmethod
@@ -83,6 +95,238 @@ class StreamCRUD(unittest.TestCase):
         other_port.fetch_streams()
         self.assertEqual(len(other_port.streams), 0)
 
+    def test_add_streams(self):
+        port = self.layer.ost6
+        streams = port.add_streams(
+            [[protocols.Mac(), protocols.Ethernet()]] * 50 +
+            [{'name': 'bulk_{}'.format(i), 'num_packets': i}
+             for i in range(50)])
+        self.assertEqual(len(streams), 100)
+        self.assertEqual(len(port.streams), 100)
+        self.assertEqual(len(set(s.stream_id for s in streams)), 100)
+
+        other_port = utils.get_fresh_port('ost6')
+        other_port.fetch_streams()
+        self.assertEqual(len(other_port.streams), 100)
+        other_stream = other_port.get_stream(streams[0].stream_id)
+        self.assertTrue(isinstance(other_stream.layers[0], protocols.Mac))
+        self.assertTrue(isinstance(other_stream.layers[1], protocols.Ethernet))
+        other_stream = other_port.get_stream(streams[-1].stream_id)
+        self.assertEqual(other_stream.name, 'bulk_49')
+        self.assertEqual(other_stream.num_packets, 49)
+
+        while port.streams:
+            port.del_stream(port.streams[-1].stream_id)
+
+    def test_batch(self):
+        drone = self.layer.drone
+        port = self.layer.ost6
+        with drone.batch():
+            streams = port.add_streams([[protocols.Mac()]] * 5)
+            stream = port.add_stream()
+            stream.name = 'batched'
+            stream.save()
+            streams[0].name = 'batched_0'
+            port.save()
+            port.del_stream(streams[-1].stream_id)
+            # nothing has been sent yet
+            other_port = utils.get_fresh_port('ost6')
+            other_port.fetch_streams()
+            self.assertEqual(len(other_port.streams), 0)
+        other_port.fetch_streams()
+        self.assertEqual(len(other_port.streams), 5)
+        self.assertEqual(len(other_port.get_streams_by_name('batched')), 1)
+        self.assertEqual(len(other_port.get_streams_by_name('batched_0')), 1)
+
+        # reads inside a batch see the previous writes
+        with drone.batch():
+            port.del_streams(port.streams.ids())
+            port.fetch_streams()
+            self.assertEqual(len(port.streams), 0)
+
+    def test_set_field(self):
+        port = self.layer.ost6
+        streams = port.add_streams(
+            [[protocols.Mac(), protocols.Ethernet(), protocols.IPv4(),
+              protocols.Udp()] for _ in range(10)])
+        port.set_field(streams, 'IPv4.destination',
+                       range(0x0a000001, 0x0a000001 + 10))
+        port.set_field([stream.stream_id for stream in streams],
+                       'Udp.source', 1234)
+        port.set_field(streams, 'num_packets', range(10))
+        port.save()
+        other_port = utils.get_fresh_port('ost6')
+        other_port.fetch_streams()
+        for i, stream in enumerate(other_port.streams):
+            self.assertEqual(stream.layers[2].destination,
+                             '10.0.0.{}'.format(i + 1))
+            self.assertEqual(stream.layers[3].source, 1234)
+            self.assertEqual(stream.num_packets, i)
+        with self.assertRaises(ValueError):
+            port.set_field(streams, 'Tcp.source', 1234)
+        with self.assertRaises(ValueError):
+            port.set_field(streams, 'Udp.source', [1, 2])
+        port.del_streams(port.streams.ids())
+
+    def test_add_streams_copies_layers(self):
+        port = self.layer.ost6
+        layers = [protocols.Mac(), protocols.IPv4()]
+        streams = port.add_streams([layers] * 3)
+        self.assertIsNot(streams[0].layers[1], streams[1].layers[1])
+        self.assertIsNot(streams[0].layers[1], layers[1])
+        port.set_field(streams, 'IPv4.ttl', [1, 2, 3])
+        self.assertEqual([stream.layers[1].ttl for stream in streams],
+                         [1, 2, 3])
+        port.del_streams(port.streams.ids())
+
+    def test_table(self):
+        port = self.layer.ost6
+        port.add_streams(
+            [[protocols.Mac(), protocols.Ethernet(), protocols.IPv4()]
+             for _ in range(10)])
+        port.add_stream(protocols.Mac())
+        table = port.table()
+        self.assertEqual(len(table), 11)
+        self.assertIn('IPv4.destination', table.columns())
+        self.assertEqual(as_list(table['stream_id']), port.streams.ids())
+        self.assertEqual(as_list(table['IPv4.ttl']), [127] * 10 + [None])
+        if table_module.numpy is not None:
+            # the stream without IPv4 layer is not selected
+            self.assertEqual(len(table[table['IPv4.ttl'] < 200]), 10)
+
+        table['num_packets'] = range(11)
+        selection = table[[num_packets % 2 == 0
+                           for num_packets in table['num_packets']]]
+        self.assertEqual(len(selection), 6)
+        selection['is_enabled'] = True
+        self.assertEqual(as_list(table['is_enabled']),
+                         [True, False] * 5 + [True])
+        with self.assertRaises(ValueError):
+            selection['IPv4.ttl'] = 1
+        selection[:5]['IPv4.ttl'] = [1, 2, 3, 4, 5]
+        self.assertEqual(as_list(table['IPv4.ttl']),
+                         [1, 127, 2, 127, 3, 127, 4, 127, 5, 127, None])
+        table.save()
+
+        other_port = utils.get_fresh_port('ost6')
+        other_port.fetch_streams()
+        self.assertEqual(as_list(other_port.table()['IPv4.ttl']),
+                         [1, 127, 2, 127, 3, 127, 4, 127, 5, 127, None])
+        self.assertEqual(as_list(other_port.table()['num_packets']),
+                         range(11))
+        port.del_streams(port.streams.ids())
+
+    def test_del_replace_streams(self):
+        port = self.layer.ost6
+        streams = port.add_streams([[]] * 10)
+        port.del_streams([stream.stream_id for stream in streams[:5]])
+        self.assertEqual(port.streams, streams[5:])
+        other_port = utils.get_fresh_port('ost6')
+        other_port.fetch_streams()
+        self.assertEqual(sorted(other_port.streams.ids()),
+                         sorted(s.stream_id for s in streams[5:]))
+
+        new_streams = port.replace_streams(
+            [{'name': 'replaced_{}'.format(i), 'layers': []}
+             for i in range(3)])
+        self.assertEqual(port.streams, new_streams)
+        other_port = utils.get_fresh_port('ost6')
+        other_port.fetch_streams()
+        self.assertEqual(len(other_port.streams), 3)
+        self.assertEqual(len(other_port.get_streams_by_name('replaced_2')), 1)
+
+        port.replace_streams([])
+        self.assertEqual(port.streams, [])
+
+    def test_fetch_max_age(self):
+        port = self.layer.ost6
+        stream = port.add_stream()
+        stream.name = 'cached'
+        stream.save()
+        port.fetch_streams()
+        self.assertEqual(stream.name, 'cached')
+
+        other_port = utils.get_fresh_port('ost6')
+        other_port.fetch_streams()
+        other_stream = other_port.get_stream(stream.stream_id)
+        other_stream.name = 'changed'
+        other_stream.save()
+
+        # the stream was fetched less than 60 seconds ago
+        stream.fetch(max_age=60)
+        port.fetch_streams(max_age=60)
+        self.assertEqual(stream.name, 'cached')
+        # the default is to always fetch
+        stream.fetch()
+        self.assertEqual(stream.name, 'changed')
+
+        # replacing the local streams invalidates the cache
+        port.fetch_streams()
+        port.streams = []
+        port.fetch_streams(max_age=60)
+        self.assertEqual(len(port.streams), 1)
+
+        port.del_stream(stream.stream_id)
+
+    def test_save_unchanged(self):
+        port = self.layer.ost6
+        stream = port.add_stream(protocols.Mac(), protocols.Ethernet())
+        stream.name = 'local'
+        stream.save()
+
+        other_port = utils.get_fresh_port('ost6')
+        other_port.fetch_streams()
+        other_stream = other_port.get_stream(stream.stream_id)
+        other_stream.name = 'remote'
+        other_stream.layers[0].source = '00:11:22:33:44:55'
+        other_stream.save()
+
+        # nothing changed locally, so nothing is sent to drone
+        stream.save()
+        port.save()
+        other_port.fetch_streams()
+        self.assertEqual(other_stream.name, 'remote')
+        self.assertEqual(other_stream.layers[0].source, '00-11-22-33-44-55')
+
+        # changing a layer is enough to save the stream again
+        stream.layers[0].source = '00:00:00:00:00:01'
+        port.save()
+        other_port.fetch_streams()
+        self.assertEqual(other_stream.name, 'local')
+        self.assertEqual(other_stream.layers[0].source, '00-00-00-00-00-01')
+
+        other_stream.name = 'remote'
+        other_stream.save()
+        stream.save(force=True)
+        other_port.fetch_streams()
+        self.assertEqual(other_stream.name, 'local')
+
+        port.del_stream(stream.stream_id)
+
+    def test_save_verify(self):
+        port = self.layer.ost6
+        stream = port.add_stream(protocols.Mac(), protocols.Ethernet())
+        stream.name = 'test_save_verify'
+        stream.num_packets = 42
+        stream.save(verify=True)
+        self.assertEqual(stream.name, 'test_save_verify')
+        self.assertEqual(stream.num_packets, 42)
+        self.assertEqual(len(stream.layers), 2)
+
+        # saving again should not require any fetch, and should not lose the
+        # previous changes
+        stream.num_bursts = 3
+        stream.save()
+        other_port = utils.get_fresh_port('ost6')
+        other_port.fetch_streams()
+        other_stream = other_port.get_stream(stream.stream_id)
+        self.assertEqual(other_stream.name, 'test_save_verify')
+        self.assertEqual(other_stream.num_packets, 42)
+        self.assertEqual(other_stream.num_bursts, 3)
+        self.assertEqual(len(other_stream.layers), 2)
+
+        port.del_stream(stream.stream_id)
+
     def test_stream_attributes(self):
         port = self.layer.ost2
         stream = port.add_stream()
@@ -98,6 +342,37 @@ class StreamCRUD(unittest.TestCase):
         self.assertEqual(stream.bursts_per_sec, 1)
         self.assertEqual(stream.port_id, port.port_id)
 
+    def test_traffic_multi_port(self):
+        drone = self.layer.drone
+        tx = self.layer.tx1
+        rx = self.layer.rx1
+        for stream in tx.streams:
+            stream.is_enabled = False
+        stream = tx.add_stream(protocols.Mac(),
+                               protocols.Ethernet(),
+                               protocols.IPv4(),
+                               protocols.Tcp(),
+                               protocols.Payload())
+        stream.packets_per_sec = 100
+        stream.num_packets = 10
+        stream.is_enabled = True
+        tx.save()
+        drone.clear_stats([tx, rx])
+        drone.start_capture([rx])
+        drone.start_send([tx.port_id])
+        time.sleep(1)
+        drone.stop_send([tx])
+        drone.stop_capture([rx])
+        self.assertEqual(int(tx.get_stats()['tx_pkts']), 10)
+        self.assertEqual(int(rx.get_stats()['rx_pkts']), 10)
+        stats = drone.get_stats([tx, rx])
+        self.assertEqual(stats.port_ids, [tx.port_id, rx.port_id])
+        self.assertEqual([int(value) for value in stats.tx_pkts], [10, 0])
+        self.assertEqual([int(value) for value in stats['rx_pkts']], [0, 10])
+        self.assertEqual(int(stats.to_dict(tx)['tx_pkts']), 10)
+        self.assertEqual(int(stats.to_dicts()[rx.port_id]['rx_pkts']), 10)
+        tx.del_stream(stream.stream_id)
+
     def test_update_attributes(self):
         port = self.layer.ost3
         stream = port.add_stream()
@@ -0,0 +1,585 @@
+import random
+import socket
+import threading
+import time
+from nose2.compat import unittest
+from ostinato.core import ost_pb
+from simple_ostinato import Drone
+from simple_ostinato import protocols
+from simple_ostinato import stream as stream_module
+from simple_ostinato.drone import ParallelError
+from simple_ostinato.rpc import BatchError
+
+
+class Rendezvous(object):
+
+    """
+    Make ``count`` threads wait for each other (threading.Barrier does not
+    exist on Python 2). :meth:`wait()` returns ``False`` if the other threads
+    did not arrive within ``timeout`` seconds.
+    """
+
+    def __init__(self, count):
+        self.count = count
+        self.arrived = 0
+        self.condition = threading.Condition()
+
+    def wait(self, timeout=5):
+        deadline = time.time() + timeout
+        with self.condition:
+            self.arrived += 1
+            self.condition.notify_all()
+            while self.arrived < self.count:
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    return False
+                self.condition.wait(remaining)
+            return True
+
+
+class FakeProxy(object):
+
+    """
+    In-memory replacement for ``ostinato.core.DroneProxy``, with a few ports.
+    It records an error if two calls overlap, or if a call is inconsistent
+    with the streams that exist (adding a stream twice, modifying or deleting
+    a stream that does not exist). Each call takes ``latency`` seconds.
+
+    :meth:`clone()` returns another connection to the same fake drone
+    instance. The calls made on the stream configuration of the ports in
+    ``failing_ports`` raise an exception. Setting ``lost`` to ``True``
+    simulates a lost connection: the next call raises ``socket.error``, until
+    the proxy is connected again. Setting ``lost_after_call`` to ``True``
+    makes the next call raise ``socket.error`` after it has been performed.
+    If ``rendezvous`` is set, ``modifyStream`` waits for it, and records an
+    error if the other calls do not arrive.
+    """
+
+    host = 'fake'
+
+    def __init__(self, port_count, latency=0, failing_ports=()):
+        self.port_count = port_count
+        self.latency = latency
+        self.failing_ports = failing_ports
+        self.streams = dict((port_id, {}) for port_id in range(port_count))
+        self.errors = []
+        self.connections = 1
+        self.calls = []
+        self.connects = 0
+        self.lost = False
+        self.lost_after_call = False
+        self.rendezvous = None
+        # if set, getCaptureBuffer sets capture_started and waits for
+        # capture_done
+        self.capture_started = None
+        self.capture_done = None
+        self._busy = False
+
+    def clone(self):
+        proxy = FakeProxy(self.port_count, self.latency, self.failing_ports)
+        proxy.streams = self.streams
+        proxy.errors = self.errors
+        proxy.rendezvous = self.rendezvous
+        self.connections += 1
+        return proxy
+
+    def _enter(self, name):
+        if self._busy:
+            self.errors.append('{} overlaps another call'.format(name))
+        self._busy = True
+        # give the other threads a chance to run in the middle of the call
+        time.sleep(self.latency)
+
+    def _check_port(self, port_id):
+        if port_id in self.failing_ports:
+            raise RuntimeError('port {} is broken'.format(port_id))
+
+    def _leave(self):
+        self._busy = False
+
+    def __getattr__(self, name):
+        if name.startswith('_'):
+            raise AttributeError(name)
+        handler = getattr(self, '_' + name)
+
+        def call(*args):
+            self._enter(name)
+            try:
+                if name in ('connect', 'disconnect'):
+                    return handler(*args)
+                if self.lost:
+                    raise socket.error('connection lost')
+                self.calls.append(name)
+                result = handler(*args)
+                if self.lost_after_call:
+                    self.lost_after_call = False
+                    raise socket.error('connection lost')
+                return result
+            finally:
+                self._leave()
+        return call
+
+    def _connect(self):
+        self.connects += 1
+        self.lost = False
+
+    def _disconnect(self):
+        pass
+
+    def _getPortIdList(self):
+        o_port_ids = ost_pb.PortIdList()
+        for port_id in range(self.port_count):
+            o_port_ids.port_id.add().id = port_id
+        return o_port_ids
+
+    def _getPortConfig(self, o_port_ids):
+        o_ports = ost_pb.PortConfigList()
+        for o_port_id in o_port_ids.port_id:
+            o_port = o_ports.port.add()
+            o_port.port_id.id = o_port_id.id
+            o_port.name = 'port{}'.format(o_port_id.id)
+            o_port.is_enabled = True
+        return o_ports
+
+    def _modifyPort(self, o_ports):
+        pass
+
+    def _addStream(self, o_stream_ids):
+        self._check_port(o_stream_ids.port_id.id)
+        streams = self.streams[o_stream_ids.port_id.id]
+        for o_stream_id in o_stream_ids.stream_id:
+            if o_stream_id.id in streams:
+                self.errors.append('stream {} added twice'.format(
+                    o_stream_id.id))
+            o_stream = ost_pb.Stream()
+            o_stream.stream_id.id = o_stream_id.id
+            streams[o_stream_id.id] = o_stream
+
+    def _modifyStream(self, o_streams):
+        self._check_port(o_streams.port_id.id)
+        if self.rendezvous is not None and not self.rendezvous.wait():
+            self.errors.append('modifyStream calls were not concurrent')
+        streams = self.streams[o_streams.port_id.id]
+        for o_stream in o_streams.stream:
+            if o_stream.stream_id.id not in streams:
+                self.errors.append('stream {} modified but does not exist'
+                                   .format(o_stream.stream_id.id))
+            stored = ost_pb.Stream()
+            stored.CopyFrom(o_stream)
+            streams[o_stream.stream_id.id] = stored
+
+    def _deleteStream(self, o_stream_ids):
+        streams = self.streams[o_stream_ids.port_id.id]
+        for o_stream_id in o_stream_ids.stream_id:
+            if streams.pop(o_stream_id.id, None) is None:
+                self.errors.append('stream {} deleted but does not exist'
+                                   .format(o_stream_id.id))
+
+    def _getStreamIdList(self, o_port_id):
+        self._check_port(o_port_id.id)
+        o_stream_ids = ost_pb.StreamIdList()
+        o_stream_ids.port_id.id = o_port_id.id
+        for stream_id in sorted(self.streams[o_port_id.id]):
+            o_stream_ids.stream_id.add().id = stream_id
+        return o_stream_ids
+
+    def _getStreamConfig(self, o_stream_ids):
+        streams = self.streams[o_stream_ids.port_id.id]
+        o_streams = ost_pb.StreamConfigList()
+        o_streams.port_id.id = o_stream_ids.port_id.id
+        for o_stream_id in o_stream_ids.stream_id:
+            o_streams.stream.add().CopyFrom(streams[o_stream_id.id])
+        return o_streams
+
+    def _getCaptureBuffer(self, o_port_id):
+        if self.capture_started is not None:
+            self.capture_started.set()
+            self.capture_done.wait()
+        return 'capture of port {}'.format(o_port_id.id)
+
+    def _startTransmit(self, o_port_ids):
+        pass
+
+    def _stopTransmit(self, o_port_ids):
+        pass
+
+
+class TestThreads(unittest.TestCase):
+
+    def setUp(self):
+        self.drone = Drone('fake', connect=False)
+        self.proxy = self.drone._drone = FakeProxy(port_count=4)
+        self.drone.fetch_ports()
+
+    def run_threads(self, targets):
+        errors = []
+
+        def run(target):
+            try:
+                target()
+            except Exception as exc:
+                errors.append(exc)
+        threads = [threading.Thread(target=run, args=(target,))
+                   for target in targets]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(errors, [])
+        self.assertEqual(self.proxy.errors, [])
+
+    def test_concurrent_ports(self):
+        # several threads per port add, modify and delete streams, while
+        # other threads fetch the ports and start and stop transmitting.
+        def configure(port, seed):
+            rand = random.Random(seed)
+            for _ in range(20):
+                streams = port.add_streams([{'num_packets': seed}] * 3)
+                for stream in streams:
+                    stream.num_packets = rand.randint(1, 1000)
+                    stream.save()
+                port.del_stream(rand.choice(streams).stream_id)
+                if rand.random() < 0.2:
+                    port.fetch_streams()
+
+        def control():
+            for _ in range(20):
+                self.drone.fetch_ports()
+                self.drone.start_send()
+                self.drone.stop_send()
+
+        targets = []
+        for i in range(16):
+            port = self.drone.ports[i % len(self.drone.ports)]
+            targets.append(lambda port=port, seed=i: configure(port, seed))
+        targets.extend([control] * 4)
+        self.run_threads(targets)
+
+        for port in self.drone.ports:
+            remote_streams = self.proxy.streams[port.port_id]
+            # 4 threads per port, each of them kept 2 streams per iteration
+            self.assertEqual(len(remote_streams), 4 * 20 * 2)
+            self.assertEqual(sorted(port.streams.ids()),
+                             sorted(remote_streams))
+            port.fetch_streams()
+            self.assertEqual(len(port.streams), 4 * 20 * 2)
+
+    def test_concurrent_batches(self):
+        # each thread has its own batch
+        def batch(port):
+            for _ in range(20):
+                with self.drone.batch():
+                    streams = port.add_streams([{}] * 2)
+                    port.del_stream(streams[0].stream_id)
+
+        self.run_threads([lambda port=port: batch(port)
+                          for port in self.drone.ports])
+        for port in self.drone.ports:
+            self.assertEqual(len(self.proxy.streams[port.port_id]), 20)
+
+    def test_load_protocols(self):
+        # the protocols are only loaded once, even if several threads need
+        # them at the same time
+        extension = protocols.Mac._extension
+        load = extension.load
+        loads = []
+
+        def slow_load():
+            loads.append(None)
+            # let the other threads run while the protocols are loading
+            time.sleep(0.01)
+            return load()
+        loaded = dict(stream_module._PROTOCOLS)
+        stream_module._PROTOCOLS.clear()
+        extension.load = slow_load
+        try:
+            self.run_threads([stream_module._load_protocols] * 8)
+        finally:
+            del extension.load
+            stream_module._PROTOCOLS.update(loaded)
+        self.assertEqual(len(loads), 1)
+
+    def test_interrupted_batch(self):
+        # the batch is closed even if the block is interrupted
+        port = self.drone.ports[0]
+        with self.assertRaises(KeyboardInterrupt):
+            with self.drone.batch():
+                port.add_stream()
+                raise KeyboardInterrupt
+        self.assertFalse(self.drone._rpc.in_batch)
+        self.assertEqual(len(self.proxy.streams[0]), 0)
+        port.add_stream()
+        self.assertEqual(len(self.proxy.streams[0]), 1)
+
+
+class TestPortErrors(unittest.TestCase):
+
+    def setUp(self):
+        self.drone = Drone('fake', connect=False)
+        self.proxy = self.drone._drone = FakeProxy(port_count=2)
+        self.drone.fetch_ports()
+        self.port = self.drone.ports[0]
+
+    def test_del_streams(self):
+        streams = self.port.add_streams([{}] * 3)
+        # unknown IDs are rejected before anything is deleted
+        with self.assertRaises(ValueError):
+            self.port.del_streams([streams[0].stream_id, 42])
+        self.assertEqual(len(self.proxy.streams[0]), 3)
+        self.assertEqual(self.port.streams, streams)
+        # an ID given twice is deleted once
+        self.port.del_streams([streams[0].stream_id] * 2)
+        self.assertEqual(sorted(self.proxy.streams[0]),
+                         [streams[1].stream_id, streams[2].stream_id])
+        self.assertEqual(self.port.streams, streams[1:])
+        self.assertEqual(len(self.port.add_streams([{}] * 2)), 2)
+        self.assertEqual(sorted(self.proxy.streams[0]), [0, 1, 2, 3])
+        self.assertEqual(self.proxy.errors, [])
+
+    def test_set_field(self):
+        # a subclass with the same name, whose ttl setter is overridden
+        class IPv4(protocols.IPv4):
+            @property
+            def ttl(self):
+                return self._ttl
+
+            @ttl.setter
+            def ttl(self, value):
+                self._ttl = value * 2
+        streams = self.port.add_streams([[protocols.IPv4()],
+                                         [IPv4()], [protocols.IPv4()]])
+        self.port.set_field(streams, 'IPv4.ttl', [1, 2, 3])
+        self.assertEqual([stream.layers[0].ttl for stream in streams],
+                         [1, 4, 3])
+        self.assertIsInstance(streams[1].layers[0], IPv4)
+        other_stream = self.drone.ports[1].add_stream(protocols.IPv4())
+        for invalid in ([streams[0].stream_id, 42], [other_stream]):
+            with self.assertRaises(ValueError):
+                self.port.set_field(invalid, 'IPv4.ttl', 4)
+        self.assertEqual(other_stream.layers[0].ttl, 127)
+        self.assertEqual(streams[0].layers[0].ttl, 1)
+
+    def test_add_streams_save_error(self):
+        def modify_stream(o_streams):
+            raise RuntimeError('modifyStream failed')
+        self.proxy._modifyStream = modify_stream
+        with self.assertRaises(RuntimeError):
+            self.port.add_streams([{'num_packets': 5}] * 2)
+        # the streams have been created, and their configuration can be saved
+        # later
+        self.assertEqual(self.port.streams.ids(), [0, 1])
+        del self.proxy._modifyStream
+        self.port.save()
+        self.assertEqual([o_stream.control.num_packets
+                          for o_stream in self.proxy.streams[0].values()],
+                         [5, 5])
+        self.assertEqual(self.proxy.errors, [])
+
+    def test_batch_errors(self):
+        streams = self.port.add_streams([{}] * 2)
+
+        # the streams that could not be saved are still modified
+        def modify_stream(o_streams):
+            raise RuntimeError('modifyStream failed')
+        self.proxy._modifyStream = modify_stream
+        with self.assertRaises(BatchError):
+            with self.drone.batch():
+                streams[0].num_packets = 7
+                streams[0].save()
+                self.port.transmit_mode = 'INTERLEAVED'
+                self.port.save()
+        del self.proxy._modifyStream
+        self.assertTrue(streams[0]._is_dirty())
+        self.assertFalse(self.port._dirty)
+        self.port.save()
+        remote_streams = self.proxy.streams[0]
+        self.assertEqual(remote_streams[0].control.num_packets, 7)
+
+        # so are the streams whose changes are discarded, and the stream IDs
+        # are fetched again before the next allocation
+        with self.assertRaises(ValueError):
+            with self.drone.batch():
+                streams[1].num_packets = 8
+                streams[1].save()
+                self.port.del_stream(streams[0].stream_id)
+                raise ValueError
+        self.assertTrue(streams[1]._is_dirty())
+        self.assertEqual(self.port.add_stream().stream_id, 2)
+        self.port.save()
+        self.assertEqual(remote_streams[1].control.num_packets, 8)
+        self.assertEqual(sorted(remote_streams), [0, 1, 2])
+        self.assertEqual(self.proxy.errors, [])
+
+    def test_add_stream_errors(self):
+        # the ID of a stream that could not be added is reused
+        self.proxy.failing_ports = (0, )
+        with self.assertRaises(RuntimeError):
+            self.port.add_streams([{}] * 2)
+        self.proxy.failing_ports = ()
+        self.assertEqual(self.port.add_stream().stream_id, 0)
+        # if the connection is lost, the stream may have been added anyway,
+        # so its ID is not reused
+        self.proxy.lost_after_call = True
+        with self.assertRaises(socket.error):
+            self.port.add_stream()
+        self.assertEqual(self.port.add_stream().stream_id, 2)
+        self.assertEqual(sorted(self.proxy.streams[0]), [0, 1, 2])
+        self.assertEqual(self.proxy.errors, [])
+
+
+class TestParallelPorts(unittest.TestCase):
+
+    def setUp(self):
+        self.drone = Drone('fake', connect=False)
+        self.proxy = self.drone._drone = FakeProxy(port_count=8,
+                                                   latency=0.02)
+        self.drone._new_proxy = self.proxy.clone
+        self.drone.fetch_ports()
+        for port in self.drone.ports:
+            port.add_streams([{'num_packets': 1}] * 4)
+
+    def modify_streams(self, num_packets):
+        for port in self.drone.ports:
+            for stream in port.streams:
+                stream.num_packets = num_packets
+
+    def test_save_and_fetch(self):
+        self.modify_streams(2)
+        self.drone.save_all(workers=4)
+        self.assertEqual(self.proxy.connections, 4)
+        # the connections are reused
+        self.drone.save_all(workers=2, force=True)
+        self.assertEqual(self.proxy.connections, 4)
+        for streams in self.proxy.streams.values():
+            self.assertEqual(len(streams), 4)
+            for o_stream in streams.values():
+                self.assertEqual(o_stream.control.num_packets, 2)
+
+        for port in self.drone.ports:
+            port.streams = []
+        self.drone.fetch_all_streams(workers=4)
+        for port in self.drone.ports:
+            self.assertEqual(len(port.streams), 4)
+            self.assertEqual(port.streams[0].num_packets, 2)
+        self.assertEqual(self.proxy.errors, [])
+
+    def test_concurrent_saves(self):
+        # with one worker per port, the modifyStream calls of all the ports
+        # are in progress at the same time: each of them waits for the others
+        self.proxy.rendezvous = Rendezvous(len(self.drone.ports))
+        self.modify_streams(2)
+        self.drone.save_all(workers=len(self.drone.ports))
+        self.assertEqual(self.proxy.rendezvous.arrived, len(self.drone.ports))
+        self.assertEqual(self.proxy.errors, [])
+
+    def test_errors(self):
+        self.proxy.failing_ports = (2, 5)
+        self.modify_streams(2)
+        with self.assertRaises(ParallelError) as context:
+            self.drone.save_all(workers=3)
+        failed = sorted(port.port_id
+                        for (port, _) in context.exception.errors)
+        self.assertEqual(failed, [2, 5])
+        for port_id, streams in self.proxy.streams.items():
+            expected = 1 if port_id in (2, 5) else 2
+            for o_stream in streams.values():
+                self.assertEqual(o_stream.control.num_packets, expected)
+
+        with self.assertRaises(ParallelError) as context:
+            self.drone.fetch_all_streams(ports=[1, 2, 3])
+        self.assertEqual([port.port_id
+                          for (port, _) in context.exception.errors], [2])
+
+        # unknown port IDs are rejected before anything is done
+        self.proxy.failing_ports = ()
+        self.modify_streams(3)
+        with self.assertRaises(ValueError):
+            self.drone.save_all(ports=[1, 42])
+        for o_stream in self.proxy.streams[1].values():
+            self.assertEqual(o_stream.control.num_packets, 2)
+
+
+class TestChannels(unittest.TestCase):
+
+    def setUp(self):
+        self.drone = Drone('fake', connect=False, pool_size=3)
+        self.proxy = self.drone._drone = FakeProxy(port_count=2)
+        for channel in self.drone._channels[1:]:
+            channel.proxy = self.proxy.clone()
+        self.drone.connect()
+        self.drone.fetch_ports()
+        self.port = self.drone.ports[0]
+        self.bulk_proxies = [channel.proxy
+                             for channel in self.drone._channels[1:]]
+
+    def bulk_calls(self):
+        return sum((proxy.calls for proxy in self.bulk_proxies), [])
+
+    def test_routing(self):
+        self.port.add_streams([{}] * 3)
+        self.port.fetch_streams()
+        self.port.get_capture()
+        self.drone.start_send()
+        self.assertEqual(self.proxy.calls, [
+            'getPortIdList', 'getPortConfig', 'addStream',
+            'getStreamIdList', 'startTransmit'])
+        self.assertEqual(sorted(self.bulk_calls()), [
+            'getCaptureBuffer', 'getStreamConfig', 'modifyStream'])
+        self.assertEqual(self.proxy.errors, [])
+
+    def test_capture_does_not_block_control(self):
+        started = threading.Event()
+        done = threading.Event()
+        for proxy in self.bulk_proxies:
+            proxy.capture_started = started
+            proxy.capture_done = done
+
+        def control():
+            for _ in range(10):
+                self.drone.start_send()
+                self.drone.stop_send()
+
+        capture = threading.Thread(target=self.port.get_capture)
+        capture.start()
+        try:
+            self.assertTrue(started.wait(5))
+            # the capture holds a bulk channel until done is set: the control
+            # calls must complete in the meantime
+            control_thread = threading.Thread(target=control)
+            control_thread.start()
+            control_thread.join(5)
+            self.assertFalse(control_thread.is_alive())
+            self.assertTrue(capture.is_alive())
+        finally:
+            done.set()
+            capture.join()
+        self.assertEqual(self.proxy.calls.count('startTransmit'), 10)
+        self.assertEqual(self.proxy.errors, [])
+
+    def test_pool_size(self):
+        for pool_size in (0, -1):
+            with self.assertRaises(ValueError):
+                Drone('fake', connect=False, pool_size=pool_size)
+
+    def test_reconnect(self):
+        self.port.add_streams([{}] * 3)
+        # calls that read data are sent again
+        for proxy in self.bulk_proxies:
+            proxy.lost = True
+        self.port.streams = []
+        self.port.fetch_streams()
+        self.assertEqual(len(self.port.streams), 3)
+        self.assertEqual(sum(proxy.connects for proxy in self.bulk_proxies),
+                         len(self.bulk_proxies) + 1)
+
+        # other calls raise, but the next calls succeed
+        self.proxy.lost = True
+        with self.assertRaises(socket.error):
+            self.port.add_stream()
+        self.assertEqual(self.proxy.connects, 2)
+        self.port.add_stream()
+        self.port.fetch_streams()
+        self.assertEqual(len(self.port.streams), 4)
+        # the ID of the stream that could not be added was reused
+        self.assertEqual(sorted(self.proxy.streams[0]), [0, 1, 2, 3])
+        self.assertEqual(self.proxy.errors, [])
@@ -0,0 +1,193 @@
+import time
+from nose2.compat import unittest
+from simple_ostinato import constants
+from simple_ostinato import utils
+
+
+class Item(object):
+
+    def __init__(self, item_id, name):
+        self.item_id = item_id
+        self.name = name
+
+
+class TestIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.items = [Item(0, 'foo'), Item(1, 'bar'), Item(2, 'foo')]
+        self.index = utils.Index('item_id', self.items)
+
+    def test_list_behavior(self):
+        self.assertEqual(len(self.index), 3)
+        self.assertEqual(list(self.index), self.items)
+        self.assertEqual(self.index, self.items)
+        self.assertIs(self.index[0], self.items[0])
+        self.assertIs(self.index[-1], self.items[-1])
+        self.assertIs(self.index[1], self.items[1])
+        self.assertTrue(self.items[1] in self.index)
+        self.assertEqual(utils.Index('item_id'), [])
+        self.assertFalse(utils.Index('item_id'))
+
+    def test_lookups(self):
+        self.assertIs(self.index.get(1), self.items[1])
+        self.assertIsNone(self.index.get(3))
+        self.assertEqual(self.index.get_by_name('foo'),
+                         [self.items[0], self.items[2]])
+        self.assertEqual(self.index.get_by_name('baz'), [])
+        self.assertEqual(self.index.ids(), [0, 1, 2])
+
+    def test_append_remove(self):
+        new_item = Item(1, 'baz')
+        self.index.append(new_item)
+        self.assertEqual(len(self.index), 3)
+        self.assertIs(self.index.get(1), new_item)
+        self.assertEqual(self.index.get_by_name('bar'), [])
+        self.assertEqual(self.index.get_by_name('baz'), [new_item])
+
+        self.index.remove(self.items[0])
+        self.assertIsNone(self.index.get(0))
+        self.assertEqual(self.index.get_by_name('foo'), [self.items[2]])
+        with self.assertRaises(ValueError):
+            self.index.remove(self.items[0])
+
+    def test_positions(self):
+        self.assertEqual(self.index[1:], self.items[1:])
+        # the list of positions is built once, and kept up to date
+        positions = self.index._positions
+        new_item = Item(3, 'baz')
+        self.index.append(new_item)
+        self.assertIs(self.index[3], new_item)
+        self.assertIs(self.index._positions, positions)
+        self.index.remove(self.items[1])
+        self.assertEqual([self.index[i] for i in range(len(self.index))],
+                         [self.items[0], self.items[2], new_item])
+        self.index.append(self.items[1])
+        self.assertIs(self.index[-1], self.items[1])
+        self.assertIs(self.index[-3], self.items[2])
+        with self.assertRaises(IndexError):
+            self.index[4]
+
+    def test_rename(self):
+        item = self.items[0]
+        item.name = 'baz'
+        self.index.rename(item, 'foo')
+        self.assertEqual(self.index.get_by_name('foo'), [self.items[2]])
+        self.assertEqual(self.index.get_by_name('baz'), [item])
+        # objects that are not in the index are ignored
+        self.index.rename(Item(5, 'qux'), 'foo')
+        self.assertEqual(self.index.get_by_name('qux'), [])
+
+
+class TestIdAllocator(unittest.TestCase):
+
+    def test_allocate(self):
+        allocator = utils.IdAllocator([0, 1, 3, 5])
+        self.assertEqual(allocator.allocate_many(4), [2, 4, 6, 7])
+        allocator.release(5)
+        allocator.release(1)
+        self.assertEqual(allocator.allocate(), 1)
+        self.assertEqual(allocator.allocate(), 5)
+        self.assertEqual(allocator.allocate(), 8)
+        allocator.reset([])
+        self.assertEqual(allocator.allocate(), 0)
+
+    def test_release_unused(self):
+        # releasing an ID twice, or an ID that is not in use, does nothing
+        allocator = utils.IdAllocator([0, 1])
+        allocator.release(1)
+        allocator.release(1)
+        allocator.release(5)
+        allocator.release(2)
+        self.assertEqual(allocator.allocate_many(4), [1, 2, 3, 4])
+        allocator.release(3)
+        self.assertEqual(allocator.allocate_many(2), [3, 5])
+
+    def test_large_ids(self):
+        # the free IDs below a large used ID are kept as a range
+        allocator = utils.IdAllocator([3, 10 ** 9])
+        self.assertEqual(len(allocator._free), 2)
+        self.assertEqual(allocator.allocate_many(4), [0, 1, 2, 4])
+        allocator.reset([10 ** 9, 1])
+        self.assertEqual(allocator.allocate_many(3), [0, 2, 3])
+
+    def test_linear_cost(self):
+        # each allocation and release performs at most one heap operation, so
+        # allocating n IDs costs O(n log n) at worst
+        heapq = utils.heapq
+        operations = []
+
+        class CountingHeapq(object):
+            def __getattr__(self, name):
+                function = getattr(heapq, name)
+
+                def counted(*args):
+                    operations.append(name)
+                    return function(*args)
+                return counted
+
+        utils.heapq = CountingHeapq()
+        try:
+            allocator = utils.IdAllocator()
+            ids = allocator.allocate_many(1000)
+            for released_id in ids[::2]:
+                allocator.release(released_id)
+            allocator.allocate_many(1000)
+        finally:
+            utils.heapq = heapq
+        self.assertEqual(len(operations), 500 + 500)
+
+
+class TestIsFresh(unittest.TestCase):
+
+    def test_is_fresh(self):
+        now = time.time()
+        self.assertTrue(utils.is_fresh(now, 10))
+        self.assertFalse(utils.is_fresh(now - 20, 10))
+        self.assertFalse(utils.is_fresh(now, 0))
+        self.assertFalse(utils.is_fresh(None, 10))
+
+
+def make_enum(size):
+    attrs = dict(('KEY_{}'.format(i), i) for i in range(size))
+    return type('Enum{}'.format(size), (utils.Enum,), attrs)
+
+
+class TestEnum(unittest.TestCase):
+
+    def test_lookups(self):
+        enum = make_enum(30)
+        self.assertEqual(enum.get_value('KEY_12'), 12)
+        self.assertEqual(enum.get_key(12), 'KEY_12')
+        self.assertIsNone(enum.get_key(30))
+        self.assertEqual(sorted(enum.keys()),
+                         sorted('KEY_{}'.format(i) for i in range(30)))
+        with self.assertRaises(ValueError):
+            enum.get_value('KEY_30')
+        with self.assertRaises(AttributeError):
+            enum.KEY_12 = 13
+
+    def test_constant_cost(self):
+        # the lookups do not walk through the members: they read the same
+        # class attributes whatever the size of the enum, and never the
+        # __dict__ of the class
+        def lookup_reads(members):
+            reads = []
+
+            class CountingEnumType(type(utils.Enum)):
+                def __getattribute__(cls, name):
+                    reads.append(name)
+                    return super(CountingEnumType, cls).__getattribute__(
+                        name)
+
+            enum = CountingEnumType('Counted', (utils.Enum,), members)
+            del reads[:]
+            for key, value in members.iteritems():
+                self.assertEqual(enum.get_value(key), value)
+                self.assertIn(enum.get_key(value), members)
+            return reads
+
+        members = dict(constants._Protocols._values)
+        self.assertGreaterEqual(len(members), 25)
+        reads = lookup_reads(members)
+        self.assertNotIn('__dict__', reads)
+        self.assertEqual(lookup_reads({'SMALL': 1}) * len(members), reads)